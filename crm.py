@@ -14,7 +14,7 @@ from datetime import datetime
 from styles import StyleSheet, Theme
 from utils import DataManager, format_date, format_currency, DEFAULT_CUSTOMERS_FILE, DEFAULT_SALES_FILE, DEFAULT_PAYMENTS_FILE, show_message, show_validation_error, handle_data_error, PaymentManager
 from validation import CustomerValidator
-from search_filter import SearchFilter, AdvancedSearchDialog, QuickSearchWidget
+from search_filter import SearchFilter, SearchIndex, AdvancedSearchDialog, QuickSearchWidget
 from print_utils import PrintManager
 
 
@@ -709,6 +709,7 @@ class CRMWindow(QWidget):
                 if c.get("id") == customer_id:
                     self.customers[i] = updated_data
                     break
+            SearchIndex.invalidate("customers")
             
             # Save data
             success, error = DataManager.save_data(self.customers, DEFAULT_CUSTOMERS_FILE)
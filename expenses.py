@@ -161,12 +161,11 @@ class ExpensesWindow(QWidget):
             show_message(self, "Validation Error", error_message, QMessageBox.Warning)
             return
         
-        # Add to expenses list
-        self.expenses.append(expense_data)
-        
-        # Save data
-        success, error = DataManager.save_data(self.expenses, DEFAULT_EXPENSES_FILE)
+        # Append the expense to the expenses file
+        success, error = DataManager.append_record(expense_data, DEFAULT_EXPENSES_FILE)
         if success:
+            self.expenses.append(expense_data)
+            
             # Reset form
             self.amount_spin.setValue(0.01)
             self.date_edit.setDate(QDate.currentDate())
@@ -178,8 +177,6 @@ class ExpensesWindow(QWidget):
             show_message(self, "Success", "Expense added successfully")
         else:
             handle_data_error(self, "save expense", error)
-            # Remove the expense from memory since save failed
-            self.expenses.pop()
     
     def delete_expense(self):
         """Delete selected expense"""
@@ -280,12 +277,9 @@ class ExpensesWindow(QWidget):
     
     def apply_advanced_search(self, filters):
         """Apply advanced search filters"""
-        expenses_data, error = DataManager.load_data("expenses.json")
-        if error or not isinstance(expenses_data, list):
-            expenses_data = []
-        
-        # Apply filters
-        filtered_expenses = SearchFilter.filter_expenses(expenses_data, filters)
+        # Filter the loaded list, which add/delete keep in step with the file,
+        # so repeated searches reuse the shared search index
+        filtered_expenses = SearchFilter.filter_expenses(self.expenses, filters)
         
         # Update display
         self.refresh_expenses(filtered_expenses)
\ No newline at end of file
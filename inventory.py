@@ -14,7 +14,7 @@ from styles import StyleSheet, Theme
 from utils import DataManager, format_currency, format_date, DEFAULT_PRODUCTS_FILE, DEFAULT_MOVEMENTS_FILE, show_message, show_validation_error, handle_data_error
 from validation import ProductValidator
 from barcode_utils import BarcodeGenerator, BarcodeDisplayWidget
-from search_filter import SearchFilter, AdvancedSearchDialog, QuickSearchWidget
+from search_filter import SearchFilter, SearchIndex, AdvancedSearchDialog, QuickSearchWidget
 from print_utils import PrintManager
 
 
@@ -654,6 +654,7 @@ class InventoryWindow(QWidget):
                 if p.get("id") == product_id:
                     self.products[i] = updated_product
                     break
+            SearchIndex.invalidate("products")
             
             # Save data
             success, error = DataManager.save_data(self.products, DEFAULT_PRODUCTS_FILE)
@@ -714,13 +715,12 @@ class InventoryWindow(QWidget):
         dialog = InventoryMovementDialog(product, self.user_data, self)
         if dialog.exec() == QDialog.Accepted:
             # Save movement record first
-            self.movements.append(dialog.movement_data)
-            movements_success, movements_error = DataManager.save_data(self.movements, DEFAULT_MOVEMENTS_FILE)
+            movements_success, movements_error = DataManager.append_record(dialog.movement_data, DEFAULT_MOVEMENTS_FILE)
             
             if not movements_success:
                 handle_data_error(self, "save movement record", movements_error)
-                self.movements.pop()  # Remove from memory since save failed
                 return
+            self.movements.append(dialog.movement_data)
             
             # Update product quantity
             for i, p in enumerate(self.products):
@@ -728,6 +728,7 @@ class InventoryWindow(QWidget):
                     self.products[i]["quantity"] = dialog.new_quantity
                     self.products[i]["updated_at"] = datetime.now().isoformat()
                     break
+            SearchIndex.invalidate("products")
             
             # Save updated product data
             products_success, products_error = DataManager.save_data(self.products, DEFAULT_PRODUCTS_FILE)
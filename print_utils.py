@@ -14,7 +14,7 @@ import json
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-from utils import DataManager, format_currency, format_date, APP_NAME
+from utils import DataManager, format_currency, format_date, APP_NAME, DEFAULT_SALES_FILE, DEFAULT_PAYMENTS_FILE
 from styles import StyleSheet, Theme
 
 
@@ -568,8 +568,8 @@ class PrintFormatter:
         customers_with_company = sum(1 for customer in customers_data if customer.get('company_name'))
         
         # Load sales data to get customer purchase information
-        sales_data, _ = DataManager.load_data('sales.json')
-        payments_data, _ = DataManager.load_data('payments.json')
+        sales_data, _ = DataManager.load_data(DEFAULT_SALES_FILE)
+        payments_data, _ = DataManager.load_data(DEFAULT_PAYMENTS_FILE)
         
         # Calculate customer purchase totals
         customer_purchases = {}
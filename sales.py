@@ -6,13 +6,15 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QComboBox, QDoubleSpinBox, 
     QSpinBox, QLineEdit, QFormLayout, QGroupBox, QMessageBox,
     QHeaderView, QDialog, QDateEdit, QTextEdit, QFileDialog,
-    QProgressBar, QTabWidget
+    QProgressBar, QTabWidget, QStyledItemDelegate, QTableView
 )
-from PySide6.QtCore import Qt, Signal, QDate
+from PySide6.QtCore import Qt, Signal, QDate, QAbstractTableModel, QModelIndex, QThread
 from datetime import datetime, timedelta
 import csv
+import math
+from bisect import bisect_left, bisect_right
 import json
-from collections import defaultdict, Counter
+from collections import Counter
 
 # PDF Export
 from reportlab.lib import colors
@@ -23,16 +25,165 @@ from reportlab.lib.units import inch
 
 # Excel Export
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Alignment
 
 from styles import StyleSheet, Theme, Colors
 from utils import DataManager, format_currency, format_date, DEFAULT_SALES_FILE, DEFAULT_PRODUCTS_FILE, DEFAULT_CUSTOMERS_FILE, show_message, show_validation_error, handle_data_error, USER_TYPE_ADMIN, MovementManager
 from validation import CustomerValidator, SaleValidator
 from barcode_utils import BarcodeScannerDialog
-from search_filter import SearchFilter, AdvancedSearchDialog, QuickSearchWidget
+from search_filter import SearchFilter, SearchIndex, FilterThread, AdvancedSearchDialog, QuickSearchWidget
 from print_utils import PrintManager
 
 
+# PDF export styles, built once rather than on every export
+PDF_STYLES = getSampleStyleSheet()
+PDF_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=PDF_STYLES['Heading1'],
+    fontSize=16,
+    spaceAfter=30
+)
+PDF_SALES_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (4, 0), (6, -1), 'RIGHT'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 3),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+    ('LEFTPADDING', (0, 0), (-1, -1), 3),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+])
+PDF_TABLE_CHUNK_ROWS = 200
+
+# Excel export styles, shared by every export
+XLSX_TITLE_FONT = Font(size=14, bold=True)
+XLSX_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+XLSX_HEADER_FONT = Font(color="FFFFFF", bold=True)
+XLSX_CENTER_ALIGNMENT = Alignment(horizontal='center')
+XLSX_AMOUNT_FORMAT = '#,##0.00'
+XLSX_AMOUNT_ALIGNMENT = Alignment(horizontal='right')
+
+
+def aggregate_sales(sales_data):
+    """Compute report aggregates for a list of sales in a single pass"""
+    # Extract amounts once; fsum is also more accurate than += on floats
+    totals = [sale.get("total", 0) or 0 for sale in sales_data]
+    discounts = [sale.get("discount", 0) or 0 for sale in sales_data]
+    
+    report = {
+        "total_sales": len(sales_data),
+        "total_revenue": math.fsum(totals),
+        "total_discount": math.fsum(discounts),
+        "product_stats": {},
+        "customer_stats": {},
+        "walk_in_stats": {"transactions": 0, "revenue": 0, "items": 0},
+        "payment_stats": {}
+    }
+    product_stats = report["product_stats"]
+    customer_stats = report["customer_stats"]
+    walk_in_stats = report["walk_in_stats"]
+    payment_stats = report["payment_stats"]
+    
+    for sale, total in zip(sales_data, totals):
+        items = sale.get("items", [])
+        
+        # Product sales
+        for item in items:
+            key = f"{item.get('product_name', 'Unknown')} (ID: {item.get('product_id')})"
+            stats = product_stats.setdefault(key, {"quantity": 0, "revenue": 0, "transactions": 0})
+            stats["quantity"] += item.get("quantity", 0)
+            stats["revenue"] += item.get("total_price", 0)
+            stats["transactions"] += 1
+        
+        # Customers
+        customer_id = sale.get("customer_id")
+        if customer_id:
+            stats = customer_stats.setdefault(customer_id, {"transactions": 0, "revenue": 0, "items": 0, "name": ""})
+            stats["name"] = sale.get("customer_name") or stats["name"]
+        else:
+            stats = walk_in_stats
+        stats["transactions"] += 1
+        stats["revenue"] += total
+        stats["items"] += len(items)
+        
+        # Payment methods
+        stats = payment_stats.setdefault(sale.get("payment_method", "Unknown"), {"transactions": 0, "revenue": 0})
+        stats["transactions"] += 1
+        stats["revenue"] += total
+    
+    return report
+
+
+def numeric_item(value):
+    """Create a table item holding a number so Qt formats and sorts it natively"""
+    item = QTableWidgetItem()
+    item.setData(Qt.DisplayRole, value)
+    return item
+
+
+class CurrencyDelegate(QStyledItemDelegate):
+    """Display numeric cells as currency"""
+    
+    def displayText(self, value, locale):
+        if isinstance(value, (int, float)):
+            return format_currency(value)
+        return super().displayText(value, locale)
+
+
+class SalesTableModel(QAbstractTableModel):
+    """Table model that reads sales history rows straight from a list of sales"""
+    
+    HEADERS = ["Date", "Invoice #", "Customer", "Items", "Total", "Payment Method"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sales = []
+    
+    def set_sales(self, sales):
+        """Replace the sales shown by the model"""
+        self.beginResetModel()
+        self.sales = sales
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.sales)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        
+        sale = self.sales[index.row()]
+        column = index.column()
+        if column == 0:
+            return format_date(sale.get("created_at", ""))
+        if column == 1:
+            return sale.get("invoice_number", "")
+        if column == 2:
+            if sale.get("customer_id"):
+                return sale.get("customer_name", "Unknown")
+            return "Walk-in Customer"
+        if column == 3:
+            return len(sale.get("items", []))
+        if column == 4:
+            return float(sale.get("total", 0))
+        return sale.get("payment_method", "")
+
+
 class NewCustomerDialog(QDialog):
     """Dialog for adding a new customer"""
     
@@ -147,6 +298,13 @@ class SalesHistoryDialog(QDialog):
             handle_data_error(self, "load sales history", error)
             self.sales_data = []
         
+        # Index the searchable fields once so each keystroke is a single substring test per sale
+        self.search_index = SearchIndex("sales", self.sales_data)
+        
+        # Filtering runs on a worker thread; changes made meanwhile are applied once it finishes
+        self.filter_thread = None
+        self.filters_pending = False
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -167,15 +325,20 @@ class SalesHistoryDialog(QDialog):
         self.quick_search.advanced_search_requested.connect(self.show_advanced_search)
         search_layout.addWidget(self.quick_search)
         
+        self.filter_status = QLabel("Filtering...")
+        self.filter_status.setVisible(False)
+        search_layout.addWidget(self.filter_status)
+        
         layout.addLayout(search_layout)
         
-        # Sales table
-        self.sales_table = QTableWidget()
-        self.sales_table.setColumnCount(6)
-        self.sales_table.setHorizontalHeaderLabels(["Date", "Invoice #", "Customer", "Items", "Total", "Payment Method"])
+        # Sales table; the model reads rows from the sales list, so only visible cells are built
+        self.sales_model = SalesTableModel(self)
+        self.sales_table = QTableView()
+        self.sales_table.setModel(self.sales_model)
         self.sales_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.sales_table.selectionBehavior = QTableWidget.SelectRows
-        self.sales_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.sales_table.setSelectionBehavior(QTableView.SelectRows)
+        self.sales_table.setItemDelegateForColumn(4, CurrencyDelegate(self.sales_table))
+        self.sales_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
         layout.addWidget(self.sales_table)
         
         # Initialize search filters
@@ -246,49 +409,61 @@ class SalesHistoryDialog(QDialog):
             self.quick_search.clear_search()
     
     def apply_filters(self):
-        """Apply current filters to sales"""
-        self.filtered_sales = SearchFilter.filter_sales(self.sales_data, self.current_filters)
+        """Apply current filters to sales on a worker thread"""
+        if self.filter_thread and self.filter_thread.isRunning():
+            self.filters_pending = True
+            return
+        
+        self.filter_thread = FilterThread(SearchFilter.filter_sales, self.sales_data, dict(self.current_filters), self.search_index)
+        self.filter_thread.filter_finished.connect(self.on_filter_finished)
+        self.filter_thread.error_occurred.connect(self.on_filter_error)
+        self.filter_status.setVisible(True)
+        self.filter_thread.start()
+    
+    def on_filter_finished(self, filtered_sales):
+        """Show the filtered sales, then apply any filters changed while filtering"""
+        self.filtered_sales = filtered_sales
         self.populate_table()
+        self.apply_pending_filters()
+    
+    def on_filter_error(self, error):
+        """Handle a failed search"""
+        show_message(self, "Search Error", f"Failed to filter sales: {error}", QMessageBox.Critical)
+        self.apply_pending_filters()
+    
+    def apply_pending_filters(self):
+        """Start filtering again if the filters changed while the last search ran"""
+        self.filter_status.setVisible(False)
+        if self.filters_pending:
+            # The worker has emitted its result and is only returning from run()
+            self.filter_thread.wait()
+            self.filters_pending = False
+            self.apply_filters()
+    
+    def done(self, result):
+        """Wait for a running search before the dialog closes"""
+        if self.filter_thread and self.filter_thread.isRunning():
+            self.filter_thread.wait()
+        super().done(result)
     
     def populate_table(self):
         """Populate the sales table with filtered data"""
         # Use filtered sales data
         sales_to_show = self.filtered_sales if hasattr(self, 'filtered_sales') else self.sales_data
         
-        self.sales_table.setRowCount(len(sales_to_show))
-        
-        for row, sale in enumerate(sales_to_show):
-            # Date
-            self.sales_table.setItem(row, 0, QTableWidgetItem(format_date(sale.get("created_at", ""))))
-            
-            # Invoice number
-            self.sales_table.setItem(row, 1, QTableWidgetItem(sale.get("invoice_number", "")))
-            
-            # Customer
-            customer_name = "Walk-in Customer"
-            if sale.get("customer_id"):
-                customer_name = sale.get("customer_name", "Unknown")
-            self.sales_table.setItem(row, 2, QTableWidgetItem(customer_name))
-            
-            # Items count
-            items_count = len(sale.get("items", []))
-            self.sales_table.setItem(row, 3, QTableWidgetItem(str(items_count)))
-            
-            # Total
-            self.sales_table.setItem(row, 4, QTableWidgetItem(format_currency(sale.get("total", 0))))
-            
-            # Payment method
-            self.sales_table.setItem(row, 5, QTableWidgetItem(sale.get("payment_method", "")))
+        self.sales_model.set_sales(sales_to_show)
+        if hasattr(self, 'print_receipt_btn'):
+            self.on_selection_changed()
     
     def on_selection_changed(self):
         """Handle table selection change"""
-        has_selection = len(self.sales_table.selectedItems()) > 0
+        has_selection = self.sales_table.selectionModel().hasSelection()
         self.print_receipt_btn.setEnabled(has_selection)
         self.print_invoice_btn.setEnabled(has_selection)
     
     def get_selected_sale(self):
         """Get the currently selected sale data"""
-        current_row = self.sales_table.currentRow()
+        current_row = self.sales_table.currentIndex().row()
         if current_row >= 0 and current_row < len(self.filtered_sales):
             return self.filtered_sales[current_row]
         return None
@@ -310,6 +485,93 @@ class SalesHistoryDialog(QDialog):
             show_message(self, "No Selection", "Please select a sale to print invoice.", QMessageBox.Warning)
 
 
+def write_sales_report_xlsx(file_path, title, sales_data, get_customer_name):
+    """Write the sales report workbook to file_path"""
+    # Write-only mode streams rows to disk instead of keeping every cell in memory
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sales Report")
+    
+    # Headers
+    headers = ["Date", "Invoice Number", "Customer", "Payment Method", 
+              "Subtotal", "Discount", "Total", "Items Count", "Created By"]
+    
+    # Column widths and row heights must be set before any row is written
+    for col in range(1, len(headers) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = 15
+    
+    # Add spacing
+    ws.row_dimensions[1].height = 30
+    ws.row_dimensions[2].height = 15
+    
+    # Title
+    title_cell = WriteOnlyCell(ws, value=title)
+    title_cell.font = XLSX_TITLE_FONT
+    title_cell.alignment = XLSX_CENTER_ALIGNMENT
+    ws.append([title_cell])
+    ws.merged_cells.add('A1:I1')
+    ws.append([])
+    
+    # Add headers
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = XLSX_HEADER_FILL
+        cell.font = XLSX_HEADER_FONT
+        cell.alignment = XLSX_CENTER_ALIGNMENT
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Add data one row at a time, formatting currency cells as they are created.
+    # Only the day of an ISO timestamp is shown, so each day is formatted once
+    date_cache = {}
+    for sale in sales_data:
+        get = sale.get
+        sale_day = get("created_at", "")[:10]
+        date_str = date_cache.get(sale_day)
+        if date_str is None:
+            date_str = date_cache[sale_day] = format_date(sale_day)
+        amount_cells = []
+        for key in ("subtotal", "discount", "total"):
+            cell = WriteOnlyCell(ws, value=float(get(key, 0)))
+            cell.number_format = XLSX_AMOUNT_FORMAT
+            cell.alignment = XLSX_AMOUNT_ALIGNMENT
+            amount_cells.append(cell)
+        
+        ws.append([
+            date_str,
+            get("invoice_number", ""),
+            get_customer_name(sale),
+            get("payment_method", ""),
+            *amount_cells,
+            len(get("items", [])),
+            get("created_by", "")
+        ])
+    
+    wb.save(file_path)
+
+
+class ExcelExportThread(QThread):
+    """Thread that writes the sales report workbook off the GUI thread"""
+    
+    export_finished = Signal(str)
+    error_occurred = Signal(str)
+    
+    def __init__(self, file_path, title, sales_data, get_customer_name):
+        super().__init__()
+        self.file_path = file_path
+        self.title = title
+        self.sales_data = sales_data
+        self.get_customer_name = get_customer_name
+    
+    def run(self):
+        """Main thread execution"""
+        try:
+            write_sales_report_xlsx(self.file_path, self.title, self.sales_data, self.get_customer_name)
+            self.export_finished.emit(self.file_path)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+
+
 class SalesReportDialog(QDialog):
     """Dialog for generating comprehensive sales reports"""
     
@@ -334,6 +596,24 @@ class SalesReportDialog(QDialog):
             handle_data_error(self, "load products data", products_error)
             self.products_data = []
         
+        # Index customers by id for constant-time lookups
+        self._customers_by_id = {c.get("id"): c for c in self.customers_data}
+        
+        # Sort sales by date once so each report range is found by bisection
+        dated_sales = []
+        for sale in self.sales_data:
+            try:
+                sale_date = datetime.fromisoformat(sale.get("created_at", ""))
+            except (ValueError, TypeError):
+                continue
+            if sale_date.tzinfo is None:
+                dated_sales.append((sale_date, sale))
+        dated_sales.sort(key=lambda x: x[0])
+        self._sale_dates = [sale_date for sale_date, _ in dated_sales]
+        self._sales_by_date = [sale for _, sale in dated_sales]
+        
+        self.xlsx_export_thread = None
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -426,19 +706,20 @@ class SalesReportDialog(QDialog):
         except (ValueError, TypeError):
             return "0.00"
 
+    def get_customer_name(self, sale):
+        """Resolve the display name of a sale's customer"""
+        if sale.get("customer_name"):
+            return sale["customer_name"]
+        customer = self._customers_by_id.get(sale.get("customer_id"))
+        if customer:
+            return f"{customer.get('first_name', '')} {customer.get('last_name', '')}"
+        return "Walk-in Customer"
+
     def filter_sales_by_date(self, from_date, to_date):
         """Filter sales data by date range"""
-        filtered_sales = []
-        
-        for sale in self.sales_data:
-            try:
-                sale_date = datetime.fromisoformat(sale.get("created_at", ""))
-                if from_date <= sale_date <= to_date:
-                    filtered_sales.append(sale)
-            except (ValueError, TypeError):
-                continue
-        
-        return filtered_sales
+        start = bisect_left(self._sale_dates, from_date)
+        end = bisect_right(self._sale_dates, to_date)
+        return self._sales_by_date[start:end]
     
     def generate_report(self):
         """Generate comprehensive sales report"""
@@ -461,17 +742,20 @@ class SalesReportDialog(QDialog):
         # Clear existing tabs
         self.report_tabs.clear()
         
+        # Aggregate all report figures in a single pass
+        report = aggregate_sales(filtered_sales)
+        
         # Generate different report sections
-        self.generate_summary_tab(filtered_sales)
+        self.generate_summary_tab(report)
         self.progress_bar.setValue(40)
         
-        self.generate_top_products_tab(filtered_sales)
+        self.generate_top_products_tab(report)
         self.progress_bar.setValue(60)
         
-        self.generate_customer_analysis_tab(filtered_sales)
+        self.generate_customer_analysis_tab(report)
         self.progress_bar.setValue(80)
         
-        self.generate_payment_methods_tab(filtered_sales)
+        self.generate_payment_methods_tab(report)
         self.progress_bar.setValue(100)
         
         # Enable export buttons
@@ -483,22 +767,19 @@ class SalesReportDialog(QDialog):
         
         self.progress_bar.setVisible(False)
     
-    def generate_summary_tab(self, sales_data):
+    def generate_summary_tab(self, report):
         """Generate summary statistics tab"""
         tab = QWidget()
         layout = QVBoxLayout()
         
-        # Calculate summary statistics
-        total_sales = len(sales_data)
-        total_revenue = sum(sale.get("total", 0) for sale in sales_data)
-        total_discount = sum(sale.get("discount", 0) for sale in sales_data)
+        # Summary statistics
+        total_sales = report["total_sales"]
+        total_revenue = report["total_revenue"]
+        total_discount = report["total_discount"]
         average_sale = total_revenue / total_sales if total_sales > 0 else 0
         
-        # Count unique customers
-        unique_customers = set()
-        for sale in sales_data:
-            if sale.get("customer_id"):
-                unique_customers.add(sale.get("customer_id"))
+        # Unique customers
+        unique_customers = report["customer_stats"]
         
         # Summary text
         summary_text = f"""
@@ -527,25 +808,12 @@ DAILY AVERAGES:
         
         self.report_tabs.addTab(tab, "Summary")
     
-    def generate_top_products_tab(self, sales_data):
+    def generate_top_products_tab(self, report):
         """Generate top products analysis tab"""
         tab = QWidget()
         layout = QVBoxLayout()
         
-        # Analyze product sales
-        product_stats = defaultdict(lambda: {"quantity": 0, "revenue": 0, "transactions": 0})
-        
-        for sale in sales_data:
-            for item in sale.get("items", []):
-                product_id = item.get("product_id")
-                product_name = item.get("product_name", "Unknown")
-                quantity = item.get("quantity", 0)
-                total_price = item.get("total_price", 0)
-                
-                key = f"{product_name} (ID: {product_id})"
-                product_stats[key]["quantity"] += quantity
-                product_stats[key]["revenue"] += total_price
-                product_stats[key]["transactions"] += 1
+        product_stats = report["product_stats"]
         
         # Create table
         table = QTableWidget()
@@ -556,13 +824,15 @@ DAILY AVERAGES:
         # Sort by revenue (descending)
         sorted_products = sorted(product_stats.items(), key=lambda x: x[1]["revenue"], reverse=True)
         
+        table.setItemDelegateForColumn(2, CurrencyDelegate(table))
         table.setRowCount(len(sorted_products))
         
         for row, (product, stats) in enumerate(sorted_products):
             table.setItem(row, 0, QTableWidgetItem(product))
-            table.setItem(row, 1, QTableWidgetItem(str(stats["quantity"])))
-            table.setItem(row, 2, QTableWidgetItem(format_currency(stats["revenue"])))
-            table.setItem(row, 3, QTableWidgetItem(str(stats["transactions"])))
+            table.setItem(row, 1, numeric_item(stats["quantity"]))
+            table.setItem(row, 2, numeric_item(float(stats["revenue"])))
+            table.setItem(row, 3, numeric_item(stats["transactions"]))
+        table.setSortingEnabled(True)
         
         layout.addWidget(QLabel("Top Products by Revenue"))
         layout.addWidget(table)
@@ -570,29 +840,13 @@ DAILY AVERAGES:
         
         self.report_tabs.addTab(tab, "Top Products")
     
-    def generate_customer_analysis_tab(self, sales_data):
+    def generate_customer_analysis_tab(self, report):
         """Generate customer analysis tab"""
         tab = QWidget()
         layout = QVBoxLayout()
         
-        # Analyze customer data
-        customer_stats = defaultdict(lambda: {"transactions": 0, "revenue": 0, "items": 0})
-        walk_in_stats = {"transactions": 0, "revenue": 0, "items": 0}
-        
-        for sale in sales_data:
-            customer_id = sale.get("customer_id")
-            customer_name = sale.get("customer_name", "Walk-in Customer")
-            total = sale.get("total", 0)
-            items_count = len(sale.get("items", []))
-            
-            if customer_id:
-                customer_stats[customer_name]["transactions"] += 1
-                customer_stats[customer_name]["revenue"] += total
-                customer_stats[customer_name]["items"] += items_count
-            else:
-                walk_in_stats["transactions"] += 1
-                walk_in_stats["revenue"] += total
-                walk_in_stats["items"] += items_count
+        customer_stats = report["customer_stats"]
+        walk_in_stats = report["walk_in_stats"]
         
         # Create table
         table = QTableWidget()
@@ -601,19 +855,25 @@ DAILY AVERAGES:
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
         # Sort by revenue (descending)
-        sorted_customers = sorted(customer_stats.items(), key=lambda x: x[1]["revenue"], reverse=True)
+        sorted_customers = sorted(
+            ((self.get_customer_name({"customer_id": customer_id, "customer_name": stats["name"]}), stats)
+             for customer_id, stats in customer_stats.items()),
+            key=lambda x: x[1]["revenue"], reverse=True
+        )
         
         # Add walk-in customers at the end
         if walk_in_stats["transactions"] > 0:
             sorted_customers.append(("Walk-in Customers", walk_in_stats))
         
+        table.setItemDelegateForColumn(2, CurrencyDelegate(table))
         table.setRowCount(len(sorted_customers))
         
         for row, (customer, stats) in enumerate(sorted_customers):
             table.setItem(row, 0, QTableWidgetItem(customer))
-            table.setItem(row, 1, QTableWidgetItem(str(stats["transactions"])))
-            table.setItem(row, 2, QTableWidgetItem(format_currency(stats["revenue"])))
-            table.setItem(row, 3, QTableWidgetItem(str(stats["items"])))
+            table.setItem(row, 1, numeric_item(stats["transactions"]))
+            table.setItem(row, 2, numeric_item(float(stats["revenue"])))
+            table.setItem(row, 3, numeric_item(stats["items"]))
+        table.setSortingEnabled(True)
         
         layout.addWidget(QLabel("Customer Analysis"))
         layout.addWidget(table)
@@ -621,20 +881,12 @@ DAILY AVERAGES:
         
         self.report_tabs.addTab(tab, "Customer Analysis")
     
-    def generate_payment_methods_tab(self, sales_data):
+    def generate_payment_methods_tab(self, report):
         """Generate payment methods analysis tab"""
         tab = QWidget()
         layout = QVBoxLayout()
         
-        # Analyze payment methods
-        payment_stats = defaultdict(lambda: {"transactions": 0, "revenue": 0})
-        
-        for sale in sales_data:
-            payment_method = sale.get("payment_method", "Unknown")
-            total = sale.get("total", 0)
-            
-            payment_stats[payment_method]["transactions"] += 1
-            payment_stats[payment_method]["revenue"] += total
+        payment_stats = report["payment_stats"]
         
         # Create table
         table = QTableWidget()
@@ -645,12 +897,14 @@ DAILY AVERAGES:
         # Sort by revenue (descending)
         sorted_payments = sorted(payment_stats.items(), key=lambda x: x[1]["revenue"], reverse=True)
         
+        table.setItemDelegateForColumn(2, CurrencyDelegate(table))
         table.setRowCount(len(sorted_payments))
         
         for row, (method, stats) in enumerate(sorted_payments):
             table.setItem(row, 0, QTableWidgetItem(method))
-            table.setItem(row, 1, QTableWidgetItem(str(stats["transactions"])))
-            table.setItem(row, 2, QTableWidgetItem(format_currency(stats["revenue"])))
+            table.setItem(row, 1, numeric_item(stats["transactions"]))
+            table.setItem(row, 2, numeric_item(float(stats["revenue"])))
+        table.setSortingEnabled(True)
         
         layout.addWidget(QLabel("Payment Methods Analysis"))
         layout.addWidget(table)
@@ -681,22 +935,13 @@ DAILY AVERAGES:
                 bottomMargin=30
             )
             
-            # Styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=30
-            )
-            
             # Content elements
             elements = []
             
             # Title
             title = Paragraph(
                 f"Sales Report ({self.from_date.date().toString('yyyy-MM-dd')} to {self.to_date.date().toString('yyyy-MM-dd')})",
-                title_style
+                PDF_TITLE_STYLE
             )
             elements.append(title)
             
@@ -710,7 +955,7 @@ DAILY AVERAGES:
                 table_data.append([
                     format_date(sale.get("created_at", "")),
                     sale.get("invoice_number", ""),
-                    sale.get("customer_name", "Walk-in Customer"),
+                    self.get_customer_name(sale),
                     sale.get("payment_method", ""),
                     self.format_currency(sale.get("subtotal", 0)),
                     self.format_currency(sale.get("discount", 0)),
@@ -719,24 +964,13 @@ DAILY AVERAGES:
                     sale.get("created_by", "")
                 ])
             
-            # Create table
-            table = Table(table_data, repeatRows=1)
-            table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (4, 0), (6, -1), 'RIGHT'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 3),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-                ('LEFTPADDING', (0, 0), (-1, -1), 3),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-            ]))
-            elements.append(table)
+            # Create tables in chunks; ReportLab's layout time grows much
+            # faster than linearly with the row count of a single table
+            header, rows = table_data[0], table_data[1:]
+            for start in range(0, max(len(rows), 1), PDF_TABLE_CHUNK_ROWS):
+                table = Table([header] + rows[start:start + PDF_TABLE_CHUNK_ROWS], repeatRows=1)
+                table.setStyle(PDF_SALES_TABLE_STYLE)
+                elements.append(table)
             
             # Build document
             doc.build(elements)
@@ -747,7 +981,11 @@ DAILY AVERAGES:
             show_message(self, "Export Error", f"Failed to export report: {str(e)}", QMessageBox.Critical)
     
     def export_to_xlsx(self):
-        """Export report data to Excel"""
+        """Export report data to Excel in a background thread"""
+        if self.xlsx_export_thread and self.xlsx_export_thread.isRunning():
+            show_message(self, "Export In Progress", "An Excel export is already running.", QMessageBox.Warning)
+            return
+        
         try:
             file_path, _ = QFileDialog.getSaveFileName(
                 self, 
@@ -759,67 +997,34 @@ DAILY AVERAGES:
             if not file_path:
                 return
             
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Sales Report"
+            title = f"Sales Report ({self.from_date.date().toString('yyyy-MM-dd')} to {self.to_date.date().toString('yyyy-MM-dd')})"
             
-            # Title
-            ws.merge_cells('A1:I1')
-            title_cell = ws['A1']
-            title_cell.value = f"Sales Report ({self.from_date.date().toString('yyyy-MM-dd')} to {self.to_date.date().toString('yyyy-MM-dd')})"
-            title_cell.font = Font(size=14, bold=True)
-            title_cell.alignment = Alignment(horizontal='center')
-            
-            # Headers
-            headers = ["Date", "Invoice Number", "Customer", "Payment Method", 
-                      "Subtotal", "Discount", "Total", "Items Count", "Created By"]
-            
-            # Style for headers
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(color="FFFFFF", bold=True)
-            
-            # Add headers
-            for col, header in enumerate(headers, start=1):
-                cell = ws.cell(row=3, column=col)
-                cell.value = header
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-            
-            # Add data
-            for row, sale in enumerate(self.current_report_data, start=4):
-                ws.cell(row=row, column=1, value=format_date(sale.get("created_at", "")))
-                ws.cell(row=row, column=2, value=sale.get("invoice_number", ""))
-                ws.cell(row=row, column=3, value=sale.get("customer_name", "Walk-in Customer"))
-                ws.cell(row=row, column=4, value=sale.get("payment_method", ""))
-                ws.cell(row=row, column=5, value=float(sale.get("subtotal", 0)))
-                ws.cell(row=row, column=6, value=float(sale.get("discount", 0)))
-                ws.cell(row=row, column=7, value=float(sale.get("total", 0)))
-                ws.cell(row=row, column=8, value=len(sale.get("items", [])))
-                ws.cell(row=row, column=9, value=sale.get("created_by", ""))
-            
-            # Format currency columns
-            for col in [5, 6, 7]:  # Subtotal, Discount, Total columns
-                for row in range(4, len(self.current_report_data) + 4):
-                    cell = ws.cell(row=row, column=col)
-                    cell.number_format = '#,##0.00'
-                    cell.alignment = Alignment(horizontal='right')
-            
-            # Adjust column widths
-            for col in range(1, len(headers) + 1):
-                ws.column_dimensions[chr(64 + col)].width = 15
-            
-            # Add spacing
-            ws.row_dimensions[1].height = 30
-            ws.row_dimensions[2].height = 15
-            
-            wb.save(file_path)
-            
-            show_message(self, "Export Successful", f"Report exported to {file_path}")
+            # The thread works on its own copy of the list so regenerating the report can't race it
+            self.xlsx_export_thread = ExcelExportThread(file_path, title, list(self.current_report_data), self.get_customer_name)
+            self.xlsx_export_thread.export_finished.connect(self.on_xlsx_export_finished)
+            self.xlsx_export_thread.error_occurred.connect(self.on_xlsx_export_error)
+            self.export_xlsx_btn.setEnabled(False)
+            self.xlsx_export_thread.start()
             
         except Exception as e:
             show_message(self, "Export Error", f"Failed to export report: {str(e)}", QMessageBox.Critical)
     
+    def on_xlsx_export_finished(self, file_path):
+        """Handle a completed Excel export"""
+        self.export_xlsx_btn.setEnabled(True)
+        show_message(self, "Export Successful", f"Report exported to {file_path}")
+    
+    def on_xlsx_export_error(self, error):
+        """Handle a failed Excel export"""
+        self.export_xlsx_btn.setEnabled(True)
+        show_message(self, "Export Error", f"Failed to export report: {error}", QMessageBox.Critical)
+    
+    def done(self, result):
+        """Wait for a running Excel export before the dialog closes"""
+        if self.xlsx_export_thread and self.xlsx_export_thread.isRunning():
+            self.xlsx_export_thread.wait()
+        super().done(result)
+    
     def print_report(self):
         """Print the sales report"""
         try:
@@ -847,12 +1052,14 @@ class SalesWindow(QWidget):
         self.user_data = user_data
         self.theme = theme
         self.cart = []
+        self.cart_totals = (0, 0, 0)
         self.customer_info = None
         
         # Load data with error handling
         self.products, products_error = DataManager.load_data(DEFAULT_PRODUCTS_FILE)
         if products_error:
             handle_data_error(self, "load products", products_error)
+        self.products_mtime = DataManager.get_file_mtime(DEFAULT_PRODUCTS_FILE)
         
         self.customers, customers_error = DataManager.load_data(DEFAULT_CUSTOMERS_FILE)
         if customers_error:
@@ -1041,10 +1248,15 @@ class SalesWindow(QWidget):
     def refresh_products(self):
         """Refresh the products combo box"""
         self.product_combo.clear()
+        # Barcode -> (combo index, product) for constant-time scanner lookups
+        self.barcode_index = {}
         
         if self.products:
-            for product in self.products:
+            for index, product in enumerate(self.products):
                 self.product_combo.addItem(product.get("name", "Unknown"), product)
+                barcode = product.get("barcode")
+                if barcode:
+                    self.barcode_index.setdefault(barcode, (index, product))
     
     def refresh_customers(self):
         """Refresh the customers combo box"""
@@ -1064,19 +1276,13 @@ class SalesWindow(QWidget):
     def on_barcode_scanned(self, barcode_data):
         """Handle scanned barcode data"""
         # Find product by barcode
-        matching_product = None
-        for product in self.products:
-            if product.get("barcode") == barcode_data:
-                matching_product = product
-                break
+        match = self.barcode_index.get(barcode_data)
         
-        if matching_product:
+        if match:
             # Select the matching product in the combo box
-            for i in range(self.product_combo.count()):
-                if self.product_combo.itemData(i) == matching_product:
-                    self.product_combo.setCurrentIndex(i)
-                    show_message(self, "Product Found", f"Product '{matching_product.get('name')}' selected from barcode scan.")
-                    break
+            index, matching_product = match
+            self.product_combo.setCurrentIndex(index)
+            show_message(self, "Product Found", f"Product '{matching_product.get('name')}' selected from barcode scan.")
         else:
             # Show message that product was not found
             reply = QMessageBox.question(
@@ -1156,36 +1362,63 @@ class SalesWindow(QWidget):
         }
         
         self.cart.append(cart_item)
-        self.update_cart_table()
+        self.append_cart_row(cart_item)
+        
+        # Add the new item's contribution to the running totals
+        subtotal, total_discount, _ = self.cart_totals
+        subtotal += quantity * unit_price
+        total_discount += discount_amount
+        self.cart_totals = (subtotal, total_discount, subtotal - total_discount)
         self.update_totals()
         
         # Reset input fields
         self.quantity_spin.setValue(1)
         self.discount_spin.setValue(0)
     
+    def set_cart_row(self, row, item):
+        """Fill one cart table row from a cart item"""
+        self.cart_table.setItem(row, 0, QTableWidgetItem(item.get("product_name")))
+        self.cart_table.setItem(row, 1, QTableWidgetItem(item.get("unit")))
+        self.cart_table.setItem(row, 2, QTableWidgetItem(str(item.get("quantity"))))
+        
+        # Price with discount indicator
+        price_text = format_currency(item.get("unit_price"))
+        if item.get("discount_percent") > 0:
+            price_text += f" (-{item.get('discount_percent')}%)"
+        self.cart_table.setItem(row, 3, QTableWidgetItem(price_text))
+        
+        # Total price
+        self.cart_table.setItem(row, 4, QTableWidgetItem(format_currency(item.get("total_price"))))
+    
+    def append_cart_row(self, item):
+        """Add a single cart item to the end of the cart table"""
+        self.cart_table.setUpdatesEnabled(False)
+        row = self.cart_table.rowCount()
+        self.cart_table.insertRow(row)
+        self.set_cart_row(row, item)
+        self.cart_table.setUpdatesEnabled(True)
+    
     def update_cart_table(self):
         """Update the cart table with current cart items"""
+        self.cart_table.setUpdatesEnabled(False)
         self.cart_table.setRowCount(len(self.cart))
         
         for row, item in enumerate(self.cart):
-            self.cart_table.setItem(row, 0, QTableWidgetItem(item.get("product_name")))
-            self.cart_table.setItem(row, 1, QTableWidgetItem(item.get("unit")))
-            self.cart_table.setItem(row, 2, QTableWidgetItem(str(item.get("quantity"))))
-            
-            # Price with discount indicator
-            price_text = format_currency(item.get("unit_price"))
-            if item.get("discount_percent") > 0:
-                price_text += f" (-{item.get('discount_percent')}%)"
-            self.cart_table.setItem(row, 3, QTableWidgetItem(price_text))
-            
-            # Total price
-            self.cart_table.setItem(row, 4, QTableWidgetItem(format_currency(item.get("total_price"))))
+            self.set_cart_row(row, item)
+        self.cart_table.setUpdatesEnabled(True)
+    
+    def calculate_cart_totals(self):
+        """Return (subtotal, total_discount, total) for the cart in a single pass"""
+        subtotal = 0
+        total_discount = 0
+        for item in self.cart:
+            subtotal += item.get("quantity") * item.get("unit_price")
+            total_discount += item.get("discount_amount")
+        return subtotal, total_discount, subtotal - total_discount
     
     def update_totals(self):
         """Update the totals section"""
-        subtotal = sum(item.get("quantity") * item.get("unit_price") for item in self.cart)
-        total_discount = sum(item.get("discount_amount") for item in self.cart)
-        total = subtotal - total_discount
+        subtotal, total_discount, total = self.cart_totals
         
         self.subtotal_label.setText(format_currency(subtotal))
         self.total_discount_label.setText(format_currency(total_discount))
@@ -1197,11 +1430,14 @@ class SalesWindow(QWidget):
         if selected_row >= 0:
             self.cart.pop(selected_row)
             self.update_cart_table()
+            # Recompute rather than subtract so float error can't build up
+            self.cart_totals = self.calculate_cart_totals()
             self.update_totals()
     
     def clear_cart(self):
         """Clear all items from cart"""
         self.cart = []
+        self.cart_totals = (0, 0, 0)
         self.update_cart_table()
         self.update_totals()
     
@@ -1216,8 +1452,9 @@ class SalesWindow(QWidget):
             # Save customer data
             success, error = DataManager.save_data(self.customers, DEFAULT_CUSTOMERS_FILE)
             if success:
-                # Refresh customer combo box and select the new customer
-                self.refresh_customers()
+                # Add just the new customer to the combo box and select it
+                name = f"{new_customer.get('first_name', '')} {new_customer.get('last_name', '')}"
+                self.customer_combo.addItem(name, new_customer)
                 self.customer_combo.setCurrentIndex(self.customer_combo.count() - 1)
             else:
                 handle_data_error(self, "save customer data", error)
@@ -1247,13 +1484,13 @@ class SalesWindow(QWidget):
                 customer_id = customer_data.get("id")
                 customer_name = f"{customer_data.get('first_name', '')} {customer_data.get('last_name', '')}"
         
-        # Calculate totals
-        subtotal = sum(item.get("quantity") * item.get("unit_price") for item in self.cart)
-        total_discount = sum(item.get("discount_amount") for item in self.cart)
-        total = subtotal - total_discount
+        # Totals were computed by update_totals on the last cart change
+        subtotal, total_discount, total = self.cart_totals
         
-        # Generate invoice number
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        # Generate invoice number; the sale and its stock updates share one timestamp
+        now = datetime.now()
+        created_at = now.isoformat()
+        timestamp = now.strftime("%Y%m%d%H%M%S")
         invoice_number = f"INV-{timestamp}"
         
         # Create sale record
@@ -1268,7 +1505,7 @@ class SalesWindow(QWidget):
             "total": total,
             "payment_method": payment_method,
             "created_by": self.user_data.get("username"),
-            "created_at": datetime.now().isoformat()
+            "created_at": created_at
         }
         
         # Validate sale data before saving
@@ -1277,28 +1514,19 @@ class SalesWindow(QWidget):
             show_message(self, "Validation Error", validation_error, QMessageBox.Warning)
             return
         
-        # Load existing sales data
-        sales_data, load_error = DataManager.load_data(DEFAULT_SALES_FILE)
-        if load_error:
-            handle_data_error(self, "load sales data", load_error)
-            return
-        
-        # Add new sale
-        sales_data.append(sale)
-        
         # Update product quantities first
-        products_updated = self.update_product_quantities()
+        products_updated = self.update_product_quantities(created_at)
         if not products_updated:
             return
         
-        # Save sales data
-        success, save_error = DataManager.save_data(sales_data, DEFAULT_SALES_FILE)
+        # Append the sale to the sales file
+        success, save_error = DataManager.append_record(sale, DEFAULT_SALES_FILE)
         if not success:
             handle_data_error(self, "save sale data", save_error)
             return
         
         # Create movement records for inventory tracking
-        movement_success, movement_error = MovementManager.create_sale_movement(sale, self.user_data)
+        movement_success, movement_error = MovementManager.create_sale_movement(sale, self.user_data, self.products)
         if not movement_success:
             DataManager.logger.warning(f"Failed to create movement records: {movement_error}")
             # Don't fail the sale, just log the warning
@@ -1324,19 +1552,24 @@ class SalesWindow(QWidget):
         
         self.clear_cart()
     
-    def update_product_quantities(self):
+    def update_product_quantities(self, updated_at=None):
         """Update product quantities based on cart items"""
         try:
-            # Load current products
-            products, error = DataManager.load_data(DEFAULT_PRODUCTS_FILE)
-            if error:
-                handle_data_error(self, "load products for quantity update", error)
-                return False
+            # Reuse the products in memory unless another window changed the file
+            if DataManager.get_file_mtime(DEFAULT_PRODUCTS_FILE) != self.products_mtime:
+                products, error = DataManager.load_data(DEFAULT_PRODUCTS_FILE)
+                if error:
+                    handle_data_error(self, "load products for quantity update", error)
+                    return False
+                self.products = products
+                self.products_mtime = DataManager.get_file_mtime(DEFAULT_PRODUCTS_FILE)
+                self.refresh_products()
             
             # Create product lookup
-            product_lookup = {p.get("id"): p for p in products}
+            product_lookup = {p.get("id"): p for p in self.products}
             
-            # Check stock availability and update quantities
+            # Check stock availability for the whole cart before changing anything
+            remaining = {}
             for item in self.cart:
                 product_id = item.get("product_id")
                 quantity_sold = item.get("quantity", 0)
@@ -1346,23 +1579,29 @@ class SalesWindow(QWidget):
                     show_message(self, "Error", f"Product not found: {item.get('product_name', 'Unknown')}", QMessageBox.Critical)
                     return False
                 
-                current_quantity = product.get("quantity", 0)
+                current_quantity = remaining.get(product_id, product.get("quantity", 0))
                 if current_quantity < quantity_sold:
                     show_message(self, "Error", f"Insufficient stock for {product.get('name', 'Unknown')}.\nAvailable: {current_quantity}, Required: {quantity_sold}", QMessageBox.Critical)
                     return False
-                
-                # Update quantity
-                product["quantity"] = current_quantity - quantity_sold
-                product["updated_at"] = datetime.now().isoformat()
+                remaining[product_id] = current_quantity - quantity_sold
+            
+            # Update quantities, keeping the originals in case the save fails
+            originals = {product_id: dict(product_lookup[product_id]) for product_id in remaining}
+            updated_at = updated_at or datetime.now().isoformat()
+            for product_id, quantity in remaining.items():
+                product_lookup[product_id]["quantity"] = quantity
+                product_lookup[product_id]["updated_at"] = updated_at
             
             # Save updated products
-            success, save_error = DataManager.save_data(products, DEFAULT_PRODUCTS_FILE)
+            success, save_error = DataManager.save_data(self.products, DEFAULT_PRODUCTS_FILE)
             if not success:
+                for product_id, original in originals.items():
+                    product_lookup[product_id].clear()
+                    product_lookup[product_id].update(original)
                 handle_data_error(self, "update product quantities", save_error)
                 return False
             
-            # Update local products data
-            self.products = products
+            self.products_mtime = DataManager.get_file_mtime(DEFAULT_PRODUCTS_FILE)
             return True
             
         except Exception as e:
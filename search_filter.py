@@ -7,379 +7,662 @@ from PySide6.QtWidgets import (
     QFormLayout, QDialog, QTableWidget, QTableWidgetItem,
     QHeaderView, QMessageBox, QTabWidget, QSpinBox, QDoubleSpinBox
 )
-from PySide6.QtCore import Qt, QDate, Signal
-from datetime import datetime, timedelta
+from PySide6.QtCore import Qt, QDate, Signal, QThread, QTimer
+from datetime import date, datetime, timedelta
 import json
 import re
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 
 from utils import DataManager, format_currency, format_date, show_message
 
 
 class SavedSearchManager:
-    """Manager for saved search queries"""
+    """
+    Manager for saved search queries
     
-    SAVED_SEARCHES_FILE = "saved_searches.json"
+    Saved searches are kept as a JSON Lines log: saving or deleting appends one
+    operation line, and loading replays the log. The log is rewritten with only
+    the live searches once it grows past twice their number.
+    """
+    
+    SAVED_SEARCHES_FILE = "saved_searches.jsonl"
+    
+    # Replayed searches grouped by search type, and the log mtime they were read at
+    _cache = None
+    _cache_mtime = None
     
     @staticmethod
     def save_search(name: str, search_config: Dict[str, Any]) -> Tuple[bool, str]:
-        """Save a search configuration"""
+        """Save a search configuration, replacing any search with the same name"""
         try:
-            saved_searches, error = DataManager.load_data(SavedSearchManager.SAVED_SEARCHES_FILE)
-            if error or not isinstance(saved_searches, list):
-                saved_searches = []
-            
-            # Check if name already exists
-            for i, search in enumerate(saved_searches):
-                if search.get("name") == name:
-                    saved_searches[i] = {
-                        "name": name,
-                        "config": search_config,
-                        "created_at": datetime.now().isoformat(),
-                        "updated_at": datetime.now().isoformat()
-                    }
-                    break
-            else:
-                # Add new search
-                saved_searches.append({
-                    "name": name,
-                    "config": search_config,
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat()
-                })
-            
-            success, save_error = DataManager.save_data(saved_searches, SavedSearchManager.SAVED_SEARCHES_FILE)
-            return success, save_error if not success else ""
+            SavedSearchManager._cache = None
+            now = datetime.now().isoformat()
+            return DataManager.append_record({
+                "op": "upsert",
+                "name": name,
+                "config": search_config,
+                "created_at": now,
+                "updated_at": now
+            }, SavedSearchManager.SAVED_SEARCHES_FILE)
             
         except Exception as e:
             return False, str(e)
     
     @staticmethod
-    def load_saved_searches() -> List[Dict[str, Any]]:
-        """Load all saved searches"""
+    def load_saved_searches(search_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load all saved searches, or only those for one search type"""
         try:
-            saved_searches, error = DataManager.load_data(SavedSearchManager.SAVED_SEARCHES_FILE)
-            if error or not isinstance(saved_searches, list):
-                return []
-            return saved_searches
+            mtime = DataManager.get_file_mtime(SavedSearchManager.SAVED_SEARCHES_FILE)
+            if SavedSearchManager._cache is None or mtime is None or mtime != SavedSearchManager._cache_mtime:
+                SavedSearchManager._cache = SavedSearchManager._replay_log()
+                SavedSearchManager._cache_mtime = DataManager.get_file_mtime(SavedSearchManager.SAVED_SEARCHES_FILE)
+            
+            return list(SavedSearchManager._cache.get(search_type, []))
         except Exception:
             return []
     
+    @staticmethod
+    def _replay_log() -> Dict[Optional[str], List[Dict[str, Any]]]:
+        """Read the log into saved searches grouped by search type; None holds them all"""
+        try:
+            log, error = DataManager.load_data(SavedSearchManager.SAVED_SEARCHES_FILE)
+            if error or not isinstance(log, list):
+                log = []
+            
+            # Replay the log; entries without an op are plain saved searches
+            searches = {}
+            for record in log:
+                if not isinstance(record, dict):
+                    continue
+                if record.get("op") == "delete":
+                    searches.pop(record.get("name"), None)
+                else:
+                    searches[record.get("name")] = {k: v for k, v in record.items() if k != "op"}
+            
+            saved_searches = list(searches.values())
+            SavedSearchManager._maybe_compact(log, saved_searches)
+        except Exception:
+            saved_searches = []
+        
+        grouped = {None: saved_searches}
+        for search in saved_searches:
+            config = search.get("config")
+            search_type = config.get("search_type") if isinstance(config, dict) else None
+            if search_type is not None:
+                grouped.setdefault(search_type, []).append(search)
+        return grouped
+    
     @staticmethod
     def delete_saved_search(name: str) -> Tuple[bool, str]:
         """Delete a saved search"""
         try:
-            saved_searches, error = DataManager.load_data(SavedSearchManager.SAVED_SEARCHES_FILE)
-            if error or not isinstance(saved_searches, list):
-                return False, error or "Invalid saved searches data"
-            
-            saved_searches = [s for s in saved_searches if s.get("name") != name]
-            
-            success, save_error = DataManager.save_data(saved_searches, SavedSearchManager.SAVED_SEARCHES_FILE)
-            return success, save_error if not success else ""
+            SavedSearchManager._cache = None
+            return DataManager.append_record({
+                "op": "delete",
+                "name": name,
+                "updated_at": datetime.now().isoformat()
+            }, SavedSearchManager.SAVED_SEARCHES_FILE)
             
         except Exception as e:
             return False, str(e)
+    
+    @staticmethod
+    def _maybe_compact(log: List[Dict[str, Any]], saved_searches: List[Dict[str, Any]]):
+        """Rewrite the log with only the live searches once it has grown too long"""
+        if len(log) > 2 * max(len(saved_searches), 1):
+            success, error = DataManager.save_data(saved_searches, SavedSearchManager.SAVED_SEARCHES_FILE)
+            if not success:
+                DataManager.logger.warning(f"Failed to compact saved searches: {error}")
+
+
+class SearchIndex:
+    """
+    Column-oriented copy of the searchable fields of a list of records.
+    
+    Build one when a list is loaded and pass it to the SearchFilter functions so
+    repeated searches don't re-read every record. Columns are built on first use
+    and kept. Build a new index whenever the list changes.
+    
+    When no index is passed, the filters share one index per record kind. It is
+    rebuilt automatically when a different or resized list is filtered; call
+    invalidate() after records in the same list are replaced or edited in place.
+    """
+    
+    TEXT_FIELDS = {
+        "products": ("name", "barcode", "unit_type"),
+        "customers": ("first_name", "last_name", "middle_name", "company_name", "mobile", "email", "address"),
+        "sales": ("invoice_number", "customer_name", "created_by"),
+        "expenses": ("category", "details", "added_by"),
+    }
+    
+    # Bits set in contact_flags for each non-blank customer field
+    CONTACT_FLAGS = {"mobile": 1, "email": 2, "whatsapp": 4, "company_name": 8}
+    
+    # Number of filter results remembered per index
+    RESULT_CACHE_SIZE = 32
+    
+    # Day ordinal used for missing or unparseable dates
+    MISSING_DAY = np.iinfo(np.int64).min
+    
+    # Indexes shared between searches, one per record kind
+    _shared = {}
+    
+    def __init__(self, kind: str, rows: List[Dict]):
+        self.kind = kind
+        self.rows = rows
+        self.size = len(rows)
+        self._columns = {}
+        self._values = {}
+        self._numbers = {}
+        self._days = {}
+        self._codes = {}
+        self._contact_flags = None
+        self._full_names = None
+        self._text = None
+        self._last_search = None
+        self._results = {}
+    
+    def covers(self, rows: List[Dict]) -> bool:
+        """Check whether this index was built for the given list"""
+        return rows is self.rows and len(rows) == self.size
+    
+    def column(self, field: str) -> List[str]:
+        """Get a text field as a list of lowercased values"""
+        column = self._columns.get(field)
+        if column is None:
+            column = self._columns[field] = [SearchIndex.lower(row.get(field, "")) for row in self.rows]
+        return column
+    
+    def values(self, field: str) -> List[Any]:
+        """Get a field as a list of its stored values, with "" for missing ones"""
+        column = self._values.get(field)
+        if column is None:
+            column = self._values[field] = [row.get(field, "") for row in self.rows]
+        return column
+    
+    def numbers(self, field: str) -> np.ndarray:
+        """Get a numeric field as a float array; missing values count as 0 and non-numbers as NaN"""
+        column = self._numbers.get(field)
+        if column is None:
+            column = self._numbers[field] = np.fromiter(
+                (SearchIndex.to_number(row.get(field, 0)) for row in self.rows),
+                dtype=np.float64, count=self.size
+            )
+        return column
+    
+    def codes(self, field: str) -> Tuple[np.ndarray, Dict[Any, int]]:
+        """Get a categorical field as integer codes, with the value-to-code mapping"""
+        entry = self._codes.get(field)
+        if entry is None:
+            mapping = {}
+            codes = np.fromiter(
+                (mapping.setdefault(row.get(field), len(mapping)) for row in self.rows),
+                dtype=np.int32, count=self.size
+            )
+            entry = self._codes[field] = (codes, mapping)
+        return entry
+    
+    def equals(self, field: str, value: Any) -> np.ndarray:
+        """Mask of records whose field equals the given value"""
+        codes, mapping = self.codes(field)
+        return codes == mapping.get(value, -1)
+    
+    def filled(self, field: str) -> np.ndarray:
+        """Mask of records with a truthy value in the given field"""
+        return np.fromiter((bool(row.get(field)) for row in self.rows), dtype=bool, count=self.size)
+    
+    def days(self, field: str) -> np.ndarray:
+        """Get a date field as an array of day ordinals"""
+        column = self._days.get(field)
+        if column is None:
+            column = self._days[field] = np.fromiter(
+                (SearchIndex.to_day(row.get(field)) for row in self.rows),
+                dtype=np.int64, count=self.size
+            )
+        return column
+    
+    def in_date_range(self, field: str, date_from, date_to) -> np.ndarray:
+        """Mask of records whose date field falls within the given dates; either bound may be None"""
+        days = self.days(field)
+        mask = days != SearchIndex.MISSING_DAY
+        if date_from:
+            mask &= days >= date_from.toordinal()
+        if date_to:
+            mask &= days <= date_to.toordinal()
+        return mask
+    
+    @property
+    def contact_flags(self) -> np.ndarray:
+        """One byte per customer with a CONTACT_FLAGS bit set for each filled-in contact field"""
+        if self._contact_flags is None:
+            flags = np.zeros(self.size, dtype=np.uint8)
+            for field, bit in self.CONTACT_FLAGS.items():
+                filled = np.fromiter(
+                    (bool(SearchIndex.lower(row.get(field, "")).strip()) for row in self.rows),
+                    dtype=bool, count=self.size
+                )
+                flags[filled] |= bit
+            self._contact_flags = flags
+        return self._contact_flags
+    
+    @property
+    def full_names(self) -> List[str]:
+        """Lowercased "first last" name per record, the customer name sort key"""
+        if self._full_names is None:
+            self._full_names = [
+                f"{row.get('first_name', '')} {row.get('last_name', '')}".lower() for row in self.rows
+            ]
+        return self._full_names
+    
+    @property
+    def text(self) -> List[str]:
+        """One search string per record, joining its lowercased text fields"""
+        if self._text is None:
+            text_columns = [self.column(field) for field in self.TEXT_FIELDS[self.kind]]
+            if self.kind == "sales":
+                text_columns.append([
+                    "\x1f".join(SearchIndex.lower(item.get("product_name", "")) for item in row.get("items") or [])
+                    for row in self.rows
+                ])
+            self._text = ["\x1f".join(values) for values in zip(*text_columns)]
+        return self._text
+    
+    def text_matches(self, needle: str) -> np.ndarray:
+        """
+        Mask of records whose search string contains the lowercased needle
+        
+        When the needle extends the previous one, as it does while the user
+        types, only the records that matched last time are searched again.
+        """
+        if self._last_search and self._last_search[0] in needle:
+            candidates = self._last_search[1]
+        else:
+            candidates = range(self.size)
+        
+        text = self.text
+        hits = [i for i in candidates if needle in text[i]]
+        self._last_search = (needle, hits)
+        
+        mask = np.zeros(self.size, dtype=bool)
+        mask[hits] = True
+        return mask
+    
+    def remember(self, filters: Dict[str, Any], compute) -> List[int]:
+        """Get the result positions for filters, calling compute only for filters not seen before"""
+        try:
+            key = tuple(sorted(filters.items()))
+            hash(key)
+        except TypeError:
+            return compute()
+        
+        positions = self._results.get(key)
+        if positions is None:
+            if len(self._results) >= self.RESULT_CACHE_SIZE:
+                del self._results[next(iter(self._results))]
+            positions = self._results[key] = compute()
+        return positions
+    
+    @staticmethod
+    def resolve(kind: str, rows: List[Dict], index: Optional["SearchIndex"]) -> "SearchIndex":
+        """Return index if it covers rows, otherwise the shared index for them"""
+        if index is not None and index.covers(rows):
+            return index
+        
+        shared = SearchIndex._shared.get(kind)
+        if shared is None or not shared.covers(rows):
+            shared = SearchIndex._shared[kind] = SearchIndex(kind, rows)
+        return shared
+    
+    @staticmethod
+    def invalidate(kind: str):
+        """Drop the shared index for a record kind after its records change in place"""
+        SearchIndex._shared.pop(kind, None)
+    
+    @staticmethod
+    def lower(value: Any) -> str:
+        """Lowercase a field value for searching"""
+        if isinstance(value, str):
+            return value.lower()
+        return "" if value is None else str(value).lower()
+    
+    @staticmethod
+    def to_day(value: Any) -> int:
+        """Convert a date, or an ISO date or datetime string, to a day ordinal"""
+        if isinstance(value, date):
+            return value.toordinal()
+        if not value or not isinstance(value, str):
+            return SearchIndex.MISSING_DAY
+        try:
+            return datetime.fromisoformat(value).toordinal()
+        except ValueError:
+            return SearchIndex.MISSING_DAY
+    
+    @staticmethod
+    def to_number(value: Any) -> float:
+        """Convert a field value for numeric comparison"""
+        if isinstance(value, (int, float)):
+            return float(value)
+        return np.nan
+
+
+class FilterThread(QThread):
+    """
+    Thread that runs a SearchFilter function off the GUI thread
+    
+    Run one at a time per index: the index fills its columns and caches lazily.
+    """
+    
+    filter_finished = Signal(object)
+    error_occurred = Signal(str)
+    
+    def __init__(self, filter_function, rows: List[Dict], filters: Dict[str, Any], index: Optional[SearchIndex] = None):
+        super().__init__()
+        self.filter_function = filter_function
+        self.rows = rows
+        self.filters = filters
+        self.index = index
+    
+    def run(self):
+        """Main thread execution"""
+        try:
+            self.filter_finished.emit(self.filter_function(self.rows, self.filters, self.index))
+        except Exception as e:
+            self.error_occurred.emit(str(e))
 
 
 class SearchFilter:
     """Advanced search and filtering functionality"""
     
     @staticmethod
-    def filter_products(products: List[Dict], filters: Dict[str, Any]) -> List[Dict]:
-        """Filter products based on search criteria"""
-        filtered = products.copy()
-        
-        # Text search
-        if filters.get("text_search"):
-            search_text = filters["text_search"].lower()
-            filtered = [p for p in filtered if (
-                search_text in p.get("name", "").lower() or
-                search_text in p.get("barcode", "").lower() or
-                search_text in p.get("unit_type", "").lower()
-            )]
+    def _order(positions: List[int], keys, descending: bool) -> List[int]:
+        """Stably sort row positions by a prebuilt key column"""
+        if keys is None:
+            return positions
+        
+        if isinstance(keys, np.ndarray):
+            selected = keys[positions]
+            order = np.argsort(-selected if descending else selected, kind="stable")
+            positions = np.asarray(positions, dtype=np.intp)[order].tolist()
+        else:
+            positions.sort(key=keys.__getitem__, reverse=descending)
+        
+        return positions
+    
+    @staticmethod
+    def filter_products(products: List[Dict], filters: Dict[str, Any], index: Optional[SearchIndex] = None) -> List[Dict]:
+        """
+        Filter products based on search criteria
+        
+        Args:
+            products: Products to filter
+            filters: Search criteria
+            index: Optional SearchIndex built for the same list
+        """
+        index = SearchIndex.resolve("products", products, index)
+        positions = index.remember(filters, lambda: SearchFilter._match_products(products, filters, index))
+        return [products[i] for i in positions]
+    
+    @staticmethod
+    def _match_products(products: List[Dict], filters: Dict[str, Any], index: SearchIndex) -> List[int]:
+        """Get the positions of the products matching filters, in result order"""
+        # Resolve the active criteria once
+        search_text = filters["text_search"].lower() if filters.get("text_search") else None
+        min_price = filters.get("min_price")
+        max_price = filters.get("max_price")
+        min_stock = filters.get("min_stock")
+        max_stock = filters.get("max_stock")
+        unit_type = filters.get("unit_type") if filters.get("unit_type") != "All" else None
+        low_stock_only = filters.get("low_stock_only")
+        expiry_from = filters.get("expiry_from")
+        expiry_to = filters.get("expiry_to")
+        
+        # Numeric criteria are compared across all products at once
+        mask = np.ones(len(products), dtype=bool)
         
         # Price range
-        if filters.get("min_price") is not None:
-            filtered = [p for p in filtered if p.get("selling_price", 0) >= filters["min_price"]]
-        
-        if filters.get("max_price") is not None:
-            filtered = [p for p in filtered if p.get("selling_price", 0) <= filters["max_price"]]
+        if min_price is not None:
+            mask &= index.numbers("selling_price") >= min_price
+        if max_price is not None:
+            mask &= index.numbers("selling_price") <= max_price
         
         # Stock level
-        if filters.get("min_stock") is not None:
-            filtered = [p for p in filtered if p.get("quantity", 0) >= filters["min_stock"]]
+        if min_stock is not None:
+            mask &= index.numbers("quantity") >= min_stock
+        if max_stock is not None:
+            mask &= index.numbers("quantity") <= max_stock
+        
+        # Low stock filter
+        if low_stock_only:
+            mask &= index.numbers("quantity") <= index.numbers("minimum_quantity")
         
-        if filters.get("max_stock") is not None:
-            filtered = [p for p in filtered if p.get("quantity", 0) <= filters["max_stock"]]
+        # Expiry date range
+        if expiry_from or expiry_to:
+            mask &= index.in_date_range("expiry_date", expiry_from, expiry_to)
         
         # Unit type
-        if filters.get("unit_type") and filters["unit_type"] != "All":
-            filtered = [p for p in filtered if p.get("unit_type") == filters["unit_type"]]
+        if unit_type:
+            mask &= index.equals("unit_type", unit_type)
         
-        # Low stock filter
-        if filters.get("low_stock_only"):
-            filtered = [p for p in filtered if p.get("quantity", 0) <= p.get("minimum_quantity", 0)]
+        # Text search
+        if search_text:
+            mask &= index.text_matches(search_text)
         
-        # Expiry date range
-        if filters.get("expiry_from") or filters.get("expiry_to"):
-            expiry_filtered = []
-            for p in filtered:
-                expiry_date = p.get("expiry_date")
-                if not expiry_date:
-                    continue
-                
-                try:
-                    product_expiry = datetime.fromisoformat(expiry_date.replace("T00:00:00", ""))
-                    
-                    if filters.get("expiry_from"):
-                        if product_expiry < filters["expiry_from"]:
-                            continue
-                    
-                    if filters.get("expiry_to"):
-                        if product_expiry > filters["expiry_to"]:
-                            continue
-                    
-                    expiry_filtered.append(p)
-                except (ValueError, TypeError):
-                    continue
-            
-            filtered = expiry_filtered
+        positions = np.flatnonzero(mask).tolist()
         
         # Sort results
         sort_by = filters.get("sort_by", "name")
         sort_order = filters.get("sort_order", "asc")
         
         if sort_by == "name":
-            filtered.sort(key=lambda x: x.get("name", "").lower(), reverse=(sort_order == "desc"))
+            keys = index.column("name")
         elif sort_by == "price":
-            filtered.sort(key=lambda x: x.get("selling_price", 0), reverse=(sort_order == "desc"))
+            keys = index.numbers("selling_price")
         elif sort_by == "stock":
-            filtered.sort(key=lambda x: x.get("quantity", 0), reverse=(sort_order == "desc"))
+            keys = index.numbers("quantity")
         elif sort_by == "created_at":
-            filtered.sort(key=lambda x: x.get("created_at", ""), reverse=(sort_order == "desc"))
+            keys = index.values("created_at")
+        else:
+            keys = None
         
-        return filtered
+        return SearchFilter._order(positions, keys, sort_order == "desc")
     
     @staticmethod
-    def filter_customers(customers: List[Dict], filters: Dict[str, Any]) -> List[Dict]:
-        """Filter customers based on search criteria"""
-        filtered = customers.copy()
-        
-        # Text search
-        if filters.get("text_search"):
-            search_text = filters["text_search"].lower()
-            filtered = [c for c in filtered if (
-                search_text in c.get("first_name", "").lower() or
-                search_text in c.get("last_name", "").lower() or
-                search_text in c.get("middle_name", "").lower() or
-                search_text in c.get("company_name", "").lower() or
-                search_text in c.get("mobile", "").lower() or
-                search_text in c.get("email", "").lower() or
-                search_text in c.get("address", "").lower()
-            )]
+    def filter_customers(customers: List[Dict], filters: Dict[str, Any], index: Optional[SearchIndex] = None) -> List[Dict]:
+        """
+        Filter customers based on search criteria
+        
+        Args:
+            customers: Customers to filter
+            filters: Search criteria
+            index: Optional SearchIndex built for the same list
+        """
+        index = SearchIndex.resolve("customers", customers, index)
+        positions = index.remember(filters, lambda: SearchFilter._match_customers(customers, filters, index))
+        return [customers[i] for i in positions]
+    
+    @staticmethod
+    def _match_customers(customers: List[Dict], filters: Dict[str, Any], index: SearchIndex) -> List[int]:
+        """Get the positions of the customers matching filters, in result order"""
+        # Resolve the active criteria once
+        search_text = filters["text_search"].lower() if filters.get("text_search") else None
+        date_from = filters.get("date_from")
+        date_to = filters.get("date_to")
+        contact_field = {"Mobile": "mobile", "Email": "email", "WhatsApp": "whatsapp"}.get(filters.get("contact_method"))
+        required_flags = 0
+        if filters.get("has_company_only"):
+            required_flags |= SearchIndex.CONTACT_FLAGS["company_name"]
+        if contact_field:
+            required_flags |= SearchIndex.CONTACT_FLAGS[contact_field]
         
         # Registration date range
-        if filters.get("date_from") or filters.get("date_to"):
-            date_filtered = []
-            for c in filtered:
-                created_at = c.get("created_at")
-                if not created_at:
-                    continue
-                
-                try:
-                    customer_date = datetime.fromisoformat(created_at)
-                    
-                    if filters.get("date_from"):
-                        if customer_date.date() < filters["date_from"]:
-                            continue
-                    
-                    if filters.get("date_to"):
-                        if customer_date.date() > filters["date_to"]:
-                            continue
-                    
-                    date_filtered.append(c)
-                except (ValueError, TypeError):
-                    continue
-            
-            filtered = date_filtered
+        mask = np.ones(len(customers), dtype=bool)
+        if date_from or date_to:
+            mask &= index.in_date_range("created_at", date_from, date_to)
         
-        # Company filter
-        if filters.get("has_company_only"):
-            filtered = [c for c in filtered if c.get("company_name", "").strip()]
+        # Company and contact method filters, one bit test per customer
+        if required_flags:
+            mask &= (index.contact_flags & required_flags) == required_flags
+        
+        # Text search
+        if search_text:
+            mask &= index.text_matches(search_text)
         
-        # Contact method filter
-        if filters.get("contact_method") and filters["contact_method"] != "All":
-            if filters["contact_method"] == "Mobile":
-                filtered = [c for c in filtered if c.get("mobile", "").strip()]
-            elif filters["contact_method"] == "Email":
-                filtered = [c for c in filtered if c.get("email", "").strip()]
-            elif filters["contact_method"] == "WhatsApp":
-                filtered = [c for c in filtered if c.get("whatsapp", "").strip()]
+        positions = np.flatnonzero(mask).tolist()
         
         # Sort results
         sort_by = filters.get("sort_by", "name")
         sort_order = filters.get("sort_order", "asc")
         
         if sort_by == "name":
-            filtered.sort(key=lambda x: f"{x.get('first_name', '')} {x.get('last_name', '')}".lower(), 
-                         reverse=(sort_order == "desc"))
+            keys = index.full_names
         elif sort_by == "company":
-            filtered.sort(key=lambda x: x.get("company_name", "").lower(), reverse=(sort_order == "desc"))
+            keys = index.column("company_name")
         elif sort_by == "created_at":
-            filtered.sort(key=lambda x: x.get("created_at", ""), reverse=(sort_order == "desc"))
+            keys = index.values("created_at")
+        else:
+            keys = None
         
-        return filtered
+        return SearchFilter._order(positions, keys, sort_order == "desc")
     
     @staticmethod
-    def filter_sales(sales: List[Dict], filters: Dict[str, Any]) -> List[Dict]:
-        """Filter sales based on search criteria"""
-        filtered = sales.copy()
-        
-        # Text search
-        if filters.get("text_search"):
-            search_text = filters["text_search"].lower()
-            filtered = [s for s in filtered if (
-                search_text in s.get("invoice_number", "").lower() or
-                search_text in s.get("customer_name", "").lower() or
-                search_text in s.get("created_by", "").lower() or
-                any(search_text in item.get("product_name", "").lower() for item in s.get("items", []))
-            )]
-        
-        # Date range
-        if filters.get("date_from") or filters.get("date_to"):
-            date_filtered = []
-            for s in filtered:
-                created_at = s.get("created_at")
-                if not created_at:
-                    continue
-                
-                try:
-                    sale_date = datetime.fromisoformat(created_at)
-                    
-                    if filters.get("date_from"):
-                        if sale_date.date() < filters["date_from"]:
-                            continue
-                    
-                    if filters.get("date_to"):
-                        if sale_date.date() > filters["date_to"]:
-                            continue
-                    
-                    date_filtered.append(s)
-                except (ValueError, TypeError):
-                    continue
-            
-            filtered = date_filtered
-        
-        # Amount range
-        if filters.get("min_amount") is not None:
-            filtered = [s for s in filtered if s.get("total", 0) >= filters["min_amount"]]
-        
-        if filters.get("max_amount") is not None:
-            filtered = [s for s in filtered if s.get("total", 0) <= filters["max_amount"]]
+    def filter_sales(sales: List[Dict], filters: Dict[str, Any], index: Optional[SearchIndex] = None) -> List[Dict]:
+        """
+        Filter sales based on search criteria
+        
+        Args:
+            sales: Sales to filter
+            filters: Search criteria
+            index: Optional SearchIndex built for the same list
+        """
+        index = SearchIndex.resolve("sales", sales, index)
+        positions = index.remember(filters, lambda: SearchFilter._match_sales(sales, filters, index))
+        return [sales[i] for i in positions]
+    
+    @staticmethod
+    def _match_sales(sales: List[Dict], filters: Dict[str, Any], index: SearchIndex) -> List[int]:
+        """Get the positions of the sales matching filters, in result order"""
+        # Resolve the active criteria once
+        search_text = filters["text_search"].lower() if filters.get("text_search") else None
+        date_from = filters.get("date_from")
+        date_to = filters.get("date_to")
+        min_amount = filters.get("min_amount")
+        max_amount = filters.get("max_amount")
+        payment_method = filters.get("payment_method") if filters.get("payment_method") != "All" else None
+        customer_type = filters.get("customer_type")
+        created_by = filters.get("created_by") if filters.get("created_by") != "All" else None
+        
+        # Date and amount ranges, compared across all sales at once
+        mask = np.ones(len(sales), dtype=bool)
+        if date_from or date_to:
+            mask &= index.in_date_range("created_at", date_from, date_to)
+        if min_amount is not None:
+            mask &= index.numbers("total") >= min_amount
+        if max_amount is not None:
+            mask &= index.numbers("total") <= max_amount
         
         # Payment method
-        if filters.get("payment_method") and filters["payment_method"] != "All":
-            filtered = [s for s in filtered if s.get("payment_method") == filters["payment_method"]]
+        if payment_method:
+            mask &= index.equals("payment_method", payment_method)
         
         # Customer type
-        if filters.get("customer_type") and filters["customer_type"] != "All":
-            if filters["customer_type"] == "Walk-in":
-                filtered = [s for s in filtered if not s.get("customer_id")]
-            elif filters["customer_type"] == "Registered":
-                filtered = [s for s in filtered if s.get("customer_id")]
+        if customer_type == "Walk-in":
+            mask &= ~index.filled("customer_id")
+        elif customer_type == "Registered":
+            mask &= index.filled("customer_id")
         
         # Created by (salesperson)
-        if filters.get("created_by") and filters["created_by"] != "All":
-            filtered = [s for s in filtered if s.get("created_by") == filters["created_by"]]
+        if created_by:
+            mask &= index.equals("created_by", created_by)
+        
+        # Text search
+        if search_text:
+            mask &= index.text_matches(search_text)
+        
+        positions = np.flatnonzero(mask).tolist()
         
         # Sort results
         sort_by = filters.get("sort_by", "created_at")
         sort_order = filters.get("sort_order", "desc")
         
         if sort_by == "created_at":
-            filtered.sort(key=lambda x: x.get("created_at", ""), reverse=(sort_order == "desc"))
+            keys = index.values("created_at")
         elif sort_by == "total":
-            filtered.sort(key=lambda x: x.get("total", 0), reverse=(sort_order == "desc"))
+            keys = index.numbers("total")
         elif sort_by == "customer":
-            filtered.sort(key=lambda x: x.get("customer_name", "").lower(), reverse=(sort_order == "desc"))
+            keys = index.column("customer_name")
         elif sort_by == "invoice":
-            filtered.sort(key=lambda x: x.get("invoice_number", "").lower(), reverse=(sort_order == "desc"))
+            keys = index.column("invoice_number")
+        else:
+            keys = None
         
-        return filtered
+        return SearchFilter._order(positions, keys, sort_order == "desc")
     
     @staticmethod
-    def filter_expenses(expenses: List[Dict], filters: Dict[str, Any]) -> List[Dict]:
-        """Filter expenses based on search criteria"""
-        filtered = expenses.copy()
-        
-        # Text search
-        if filters.get("text_search"):
-            search_text = filters["text_search"].lower()
-            filtered = [e for e in filtered if (
-                search_text in e.get("category", "").lower() or
-                search_text in e.get("details", "").lower() or
-                search_text in e.get("added_by", "").lower()
-            )]
-        
-        # Date range
-        if filters.get("date_from") or filters.get("date_to"):
-            date_filtered = []
-            for e in filtered:
-                expense_date = e.get("date")
-                if not expense_date:
-                    continue
-                
-                try:
-                    # Handle both string dates and date objects
-                    if isinstance(expense_date, str):
-                        expense_date_obj = datetime.fromisoformat(expense_date).date()
-                    else:
-                        expense_date_obj = expense_date
-                    
-                    if filters.get("date_from"):
-                        if expense_date_obj < filters["date_from"]:
-                            continue
-                    
-                    if filters.get("date_to"):
-                        if expense_date_obj > filters["date_to"]:
-                            continue
-                    
-                    date_filtered.append(e)
-                except (ValueError, TypeError):
-                    continue
-            
-            filtered = date_filtered
-        
-        # Amount range
-        if filters.get("min_amount") is not None:
-            filtered = [e for e in filtered if e.get("amount", 0) >= filters["min_amount"]]
-        
-        if filters.get("max_amount") is not None:
-            filtered = [e for e in filtered if e.get("amount", 0) <= filters["max_amount"]]
+    def filter_expenses(expenses: List[Dict], filters: Dict[str, Any], index: Optional[SearchIndex] = None) -> List[Dict]:
+        """
+        Filter expenses based on search criteria
+        
+        Args:
+            expenses: Expenses to filter
+            filters: Search criteria
+            index: Optional SearchIndex built for the same list
+        """
+        index = SearchIndex.resolve("expenses", expenses, index)
+        positions = index.remember(filters, lambda: SearchFilter._match_expenses(expenses, filters, index))
+        return [expenses[i] for i in positions]
+    
+    @staticmethod
+    def _match_expenses(expenses: List[Dict], filters: Dict[str, Any], index: SearchIndex) -> List[int]:
+        """Get the positions of the expenses matching filters, in result order"""
+        # Resolve the active criteria once
+        search_text = filters["text_search"].lower() if filters.get("text_search") else None
+        date_from = filters.get("date_from")
+        date_to = filters.get("date_to")
+        min_amount = filters.get("min_amount")
+        max_amount = filters.get("max_amount")
+        category = filters.get("category") if filters.get("category") != "All" else None
+        added_by = filters.get("added_by") if filters.get("added_by") != "All" else None
+        
+        # Date and amount ranges, compared across all expenses at once
+        mask = np.ones(len(expenses), dtype=bool)
+        if date_from or date_to:
+            mask &= index.in_date_range("date", date_from, date_to)
+        if min_amount is not None:
+            mask &= index.numbers("amount") >= min_amount
+        if max_amount is not None:
+            mask &= index.numbers("amount") <= max_amount
         
         # Category filter
-        if filters.get("category") and filters["category"] != "All":
-            filtered = [e for e in filtered if e.get("category") == filters["category"]]
+        if category:
+            mask &= index.equals("category", category)
         
         # Added by filter
-        if filters.get("added_by") and filters["added_by"] != "All":
-            filtered = [e for e in filtered if e.get("added_by") == filters["added_by"]]
+        if added_by:
+            mask &= index.equals("added_by", added_by)
+        
+        # Text search
+        if search_text:
+            mask &= index.text_matches(search_text)
+        
+        positions = np.flatnonzero(mask).tolist()
         
         # Sort results
         sort_by = filters.get("sort_by", "date")
         sort_order = filters.get("sort_order", "desc")
         
         if sort_by == "date":
-            filtered.sort(key=lambda x: x.get("date", ""), reverse=(sort_order == "desc"))
+            keys = index.values("date")
         elif sort_by == "amount":
-            filtered.sort(key=lambda x: x.get("amount", 0), reverse=(sort_order == "desc"))
+            keys = index.numbers("amount")
         elif sort_by == "category":
-            filtered.sort(key=lambda x: x.get("category", "").lower(), reverse=(sort_order == "desc"))
+            keys = index.column("category")
         elif sort_by == "details":
-            filtered.sort(key=lambda x: x.get("details", "").lower(), reverse=(sort_order == "desc"))
+            keys = index.column("details")
+        else:
+            keys = None
         
-        return filtered
+        return SearchFilter._order(positions, keys, sort_order == "desc")
 
 
 class AdvancedSearchDialog(QDialog):
@@ -387,6 +670,13 @@ class AdvancedSearchDialog(QDialog):
     
     search_applied = Signal(dict)  # Signal emitted when search is applied
     
+    # Sort order combo text and the sort_order filter value, both ways
+    SORT_ORDERS = {"Ascending": "asc", "Descending": "desc"}
+    SORT_ORDER_TEXTS = {value: text for text, value in SORT_ORDERS.items()}
+    
+    # Lowest date of the product expiry pickers, shown as "Any" and not sent as a filter
+    ANY_EXPIRY_DATE = QDate(2000, 1, 1)
+    
     def __init__(self, search_type: str, parent=None):
         super().__init__(parent)
         self.search_type = search_type  # "products", "customers", or "sales"
@@ -394,8 +684,104 @@ class AdvancedSearchDialog(QDialog):
         self.setMinimumSize(500, 600)
         
         self.setup_ui()
+        self.filter_specs = self.build_filter_specs()
+        
+        # The combo items never change, so saved configs are matched by dict lookup
+        self.sort_by_indexes = self.item_indexes(self.sort_by_combo)
+        self.sort_order_indexes = self.item_indexes(self.sort_order_combo)
+        self.unit_indexes = self.item_indexes(self.unit_filter) if search_type == "products" else {}
         self.load_saved_searches()
     
+    @staticmethod
+    def item_indexes(combo: QComboBox) -> Dict[str, int]:
+        """Map each item text of a combo box to its first index"""
+        return {combo.itemText(i): i for i in reversed(range(combo.count()))}
+    
+    def build_filter_specs(self) -> List[Tuple[str, QWidget, Any, Any, Any]]:
+        """
+        Describe the filters of this search type
+        
+        Each entry is (key, widget, read, is_active, default): read(widget) gets
+        the widget value once, is_active(value) decides whether it becomes a
+        filter, and default is what clearing resets the widget to. Date defaults
+        are functions of today.
+        """
+        def text(widget):
+            return widget.currentText()
+        
+        def data(widget):
+            return widget.currentData()
+        
+        def checked(widget):
+            return widget.isChecked()
+        
+        def value(widget):
+            return widget.value()
+        
+        def date(widget):
+            return widget.date().toPython()
+        
+        def not_all(value):
+            return value != "All"
+        
+        def positive(value):
+            return value > 0
+        
+        def always(value):
+            return True
+        
+        def below(limit):
+            return lambda value: value < limit
+        
+        def any_expiry(today):
+            return self.ANY_EXPIRY_DATE
+        
+        def dated(value):
+            return value != self.ANY_EXPIRY_DATE.toPython()
+        
+        if self.search_type == "products":
+            return [
+                ("unit_type", self.unit_filter, text, not_all, 0),
+                ("low_stock_only", self.low_stock_check, checked, bool, False),
+                ("min_price", self.min_price_spin, value, positive, 0),
+                ("max_price", self.max_price_spin, value, below(999999.99), 999999.99),
+                ("min_stock", self.min_stock_spin, value, positive, 0),
+                ("max_stock", self.max_stock_spin, value, below(999999), 999999),
+                ("expiry_from", self.expiry_from_date, date, dated, any_expiry),
+                ("expiry_to", self.expiry_to_date, date, dated, any_expiry),
+            ]
+        
+        if self.search_type == "customers":
+            return [
+                ("contact_method", self.contact_filter, text, not_all, 0),
+                ("has_company_only", self.company_check, checked, bool, False),
+                ("date_from", self.date_from, date, always, lambda today: today.addYears(-1)),
+                ("date_to", self.date_to, date, always, lambda today: today),
+            ]
+        
+        if self.search_type == "sales":
+            return [
+                ("payment_method", self.payment_filter, text, not_all, 0),
+                ("customer_type", self.customer_type_filter, text, not_all, 0),
+                ("date_from", self.date_from, date, always, lambda today: today.addDays(-30)),
+                ("date_to", self.date_to, date, always, lambda today: today),
+                ("min_amount", self.min_amount_spin, value, positive, 0),
+                ("max_amount", self.max_amount_spin, value, below(999999.99), 999999.99),
+                ("created_by", self.created_by_filter, data, not_all, 0),
+            ]
+        
+        if self.search_type == "expenses":
+            return [
+                ("category", self.category_filter, text, not_all, 0),
+                ("added_by", self.added_by_filter, data, not_all, 0),
+                ("date_from", self.date_from, date, always, lambda today: today.addDays(-30)),
+                ("date_to", self.date_to, date, always, lambda today: today),
+                ("min_amount", self.min_amount_spin, value, positive, 0),
+                ("max_amount", self.max_amount_spin, value, below(999999.99), 999999.99),
+            ]
+        
+        return []
+    
     def setup_ui(self):
         """Setup UI components"""
         layout = QVBoxLayout()
@@ -581,14 +967,18 @@ class AdvancedSearchDialog(QDialog):
             expiry_layout = QHBoxLayout()
             self.expiry_from_date = QDateEdit()
             self.expiry_from_date.setCalendarPopup(True)
-            self.expiry_from_date.setDate(QDate.currentDate())
+            self.expiry_from_date.setMinimumDate(self.ANY_EXPIRY_DATE)
+            self.expiry_from_date.setSpecialValueText("Any")
+            self.expiry_from_date.setDate(self.ANY_EXPIRY_DATE)
             expiry_layout.addWidget(self.expiry_from_date)
             
             expiry_layout.addWidget(QLabel("to"))
             
             self.expiry_to_date = QDateEdit()
             self.expiry_to_date.setCalendarPopup(True)
-            self.expiry_to_date.setDate(QDate.currentDate().addYears(2))
+            self.expiry_to_date.setMinimumDate(self.ANY_EXPIRY_DATE)
+            self.expiry_to_date.setSpecialValueText("Any")
+            self.expiry_to_date.setDate(self.ANY_EXPIRY_DATE)
             expiry_layout.addWidget(self.expiry_to_date)
             
             expiry_widget = QWidget()
@@ -719,7 +1109,7 @@ class AdvancedSearchDialog(QDialog):
         
         # Sort order
         self.sort_order_combo = QComboBox()
-        self.sort_order_combo.addItems(["Ascending", "Descending"])
+        self.sort_order_combo.addItems(list(self.SORT_ORDERS))
         layout.addRow("Sort Order:", self.sort_order_combo)
         
         tab.setLayout(layout)
@@ -730,144 +1120,66 @@ class AdvancedSearchDialog(QDialog):
         filters = {}
         
         # Basic search
-        if self.text_search_input.text().strip():
-            filters["text_search"] = self.text_search_input.text().strip()
-        
-        if self.search_type == "products":
-            if self.unit_filter.currentText() != "All":
-                filters["unit_type"] = self.unit_filter.currentText()
-            
-            if self.low_stock_check.isChecked():
-                filters["low_stock_only"] = True
-            
-            # Advanced filters
-            if self.min_price_spin.value() > 0:
-                filters["min_price"] = self.min_price_spin.value()
-            
-            if self.max_price_spin.value() < 999999.99:
-                filters["max_price"] = self.max_price_spin.value()
-            
-            if self.min_stock_spin.value() > 0:
-                filters["min_stock"] = self.min_stock_spin.value()
-            
-            if self.max_stock_spin.value() < 999999:
-                filters["max_stock"] = self.max_stock_spin.value()
-            
-            # Expiry date filters
-            filters["expiry_from"] = self.expiry_from_date.date().toPython()
-            filters["expiry_to"] = self.expiry_to_date.date().toPython()
-        
-        elif self.search_type == "customers":
-            if self.contact_filter.currentText() != "All":
-                filters["contact_method"] = self.contact_filter.currentText()
-            
-            if self.company_check.isChecked():
-                filters["has_company_only"] = True
-            
-            # Date range
-            filters["date_from"] = self.date_from.date().toPython()
-            filters["date_to"] = self.date_to.date().toPython()
-        
-        elif self.search_type == "sales":
-            if self.payment_filter.currentText() != "All":
-                filters["payment_method"] = self.payment_filter.currentText()
-            
-            if self.customer_type_filter.currentText() != "All":
-                filters["customer_type"] = self.customer_type_filter.currentText()
-            
-            # Date range
-            filters["date_from"] = self.date_from.date().toPython()
-            filters["date_to"] = self.date_to.date().toPython()
-            
-            # Amount range
-            if self.min_amount_spin.value() > 0:
-                filters["min_amount"] = self.min_amount_spin.value()
-            
-            if self.max_amount_spin.value() < 999999.99:
-                filters["max_amount"] = self.max_amount_spin.value()
-            
-            if self.created_by_filter.currentData() != "All":
-                filters["created_by"] = self.created_by_filter.currentData()
+        text_search = self.text_search_input.text().strip()
+        if text_search:
+            filters["text_search"] = text_search
         
-        elif self.search_type == "expenses":
-            if self.category_filter.currentText() != "All":
-                filters["category"] = self.category_filter.currentText()
-            
-            if self.added_by_filter.currentData() != "All":
-                filters["added_by"] = self.added_by_filter.currentData()
-            
-            # Date range
-            filters["date_from"] = self.date_from.date().toPython()
-            filters["date_to"] = self.date_to.date().toPython()
-            
-            # Amount range
-            if self.min_amount_spin.value() > 0:
-                filters["min_amount"] = self.min_amount_spin.value()
-            
-            if self.max_amount_spin.value() < 999999.99:
-                filters["max_amount"] = self.max_amount_spin.value()
+        # Type-specific filters, each widget read once
+        for key, widget, read, is_active, _ in self.filter_specs:
+            value = read(widget)
+            if is_active(value):
+                filters[key] = value
         
         # Sorting
         filters["sort_by"] = self.sort_by_combo.currentText()
-        filters["sort_order"] = "asc" if self.sort_order_combo.currentText() == "Ascending" else "desc"
+        filters["sort_order"] = self.SORT_ORDERS.get(self.sort_order_combo.currentText(), "desc")
         
         return filters
     
     def apply_search(self):
         """Apply the search filters"""
-        filters = self.get_search_filters()
-        self.search_applied.emit(filters)
-        self.accept()
+        # Ignore a second click queued while the first search is being applied
+        if not self.apply_btn.isEnabled():
+            return
+        
+        self.apply_btn.setEnabled(False)
+        try:
+            filters = self.get_search_filters()
+            self.search_applied.emit(filters)
+            self.accept()
+        finally:
+            self.apply_btn.setEnabled(True)
     
     def clear_all_filters(self):
         """Clear all filter inputs"""
+        today = QDate.currentDate()
         self.text_search_input.clear()
         
-        if self.search_type == "products":
-            self.unit_filter.setCurrentIndex(0)
-            self.low_stock_check.setChecked(False)
-            self.min_price_spin.setValue(0)
-            self.max_price_spin.setValue(999999.99)
-            self.min_stock_spin.setValue(0)
-            self.max_stock_spin.setValue(999999)
-            self.expiry_from_date.setDate(QDate.currentDate())
-            self.expiry_to_date.setDate(QDate.currentDate().addYears(2))
-        
-        elif self.search_type == "customers":
-            self.contact_filter.setCurrentIndex(0)
-            self.company_check.setChecked(False)
-            self.date_from.setDate(QDate.currentDate().addYears(-1))
-            self.date_to.setDate(QDate.currentDate())
-        
-        elif self.search_type == "sales":
-            self.payment_filter.setCurrentIndex(0)
-            self.customer_type_filter.setCurrentIndex(0)
-            self.date_from.setDate(QDate.currentDate().addDays(-30))
-            self.date_to.setDate(QDate.currentDate())
-            self.min_amount_spin.setValue(0)
-            self.max_amount_spin.setValue(999999.99)
-            self.created_by_filter.setCurrentIndex(0)
-        
-        elif self.search_type == "expenses":
-            self.category_filter.setCurrentIndex(0)
-            self.added_by_filter.setCurrentIndex(0)
-            self.date_from.setDate(QDate.currentDate().addDays(-30))
-            self.date_to.setDate(QDate.currentDate())
-            self.min_amount_spin.setValue(0)
-            self.max_amount_spin.setValue(999999.99)
+        for _, widget, _, _, default in self.filter_specs:
+            if isinstance(widget, QComboBox):
+                widget.setCurrentIndex(default)
+            elif isinstance(widget, QCheckBox):
+                widget.setChecked(default)
+            elif isinstance(widget, QDateEdit):
+                widget.setDate(default(today))
+            else:
+                widget.setValue(default)
         
         self.sort_by_combo.setCurrentIndex(0)
         self.sort_order_combo.setCurrentIndex(0)
     
     def load_saved_searches(self):
         """Load saved searches into combo box"""
-        self.saved_combo.clear()
-        self.saved_combo.addItem("Select a saved search...", None)
-        
-        saved_searches = SavedSearchManager.load_saved_searches()
-        for search in saved_searches:
-            if search.get("config", {}).get("search_type") == self.search_type:
+        # Repaint once after the whole list is in place
+        self.saved_combo.setUpdatesEnabled(False)
+        try:
+            self.saved_combo.clear()
+            self.saved_combo.addItem("Select a saved search...", None)
+            
+            for search in SavedSearchManager.load_saved_searches(self.search_type):
                 self.saved_combo.addItem(search.get("name", "Unnamed"), search)
+        finally:
+            self.saved_combo.setUpdatesEnabled(True)
     
     def load_saved_search(self):
         """Load a saved search configuration"""
@@ -889,7 +1201,7 @@ class AdvancedSearchDialog(QDialog):
         
         if self.search_type == "products":
             if config.get("unit_type"):
-                index = self.unit_filter.findText(config["unit_type"])
+                index = self.unit_indexes.get(config["unit_type"], -1)
                 if index >= 0:
                     self.unit_filter.setCurrentIndex(index)
             
@@ -910,13 +1222,13 @@ class AdvancedSearchDialog(QDialog):
         
         # Apply sorting
         if config.get("sort_by"):
-            index = self.sort_by_combo.findText(config["sort_by"])
+            index = self.sort_by_indexes.get(config["sort_by"], -1)
             if index >= 0:
                 self.sort_by_combo.setCurrentIndex(index)
         
         if config.get("sort_order"):
-            order_text = "Ascending" if config["sort_order"] == "asc" else "Descending"
-            index = self.sort_order_combo.findText(order_text)
+            order_text = self.SORT_ORDER_TEXTS.get(config["sort_order"], "Descending")
+            index = self.sort_order_indexes.get(order_text, -1)
             if index >= 0:
                 self.sort_order_combo.setCurrentIndex(index)
     
@@ -966,6 +1278,9 @@ class QuickSearchWidget(QWidget):
     search_changed = Signal(str)  # Signal emitted when search text changes
     advanced_search_requested = Signal()  # Signal emitted when advanced search is requested
     
+    # Pause in typing, in milliseconds, before search_changed is emitted
+    DEBOUNCE_MS = 150
+    
     def __init__(self, placeholder_text="Search...", parent=None):
         super().__init__(parent)
         self.setup_ui(placeholder_text)
@@ -979,9 +1294,15 @@ class QuickSearchWidget(QWidget):
         # Search input
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText(placeholder_text)
-        self.search_input.textChanged.connect(self.search_changed.emit)
         layout.addWidget(self.search_input)
         
+        # Emit search_changed once typing pauses rather than on every keystroke
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.emit_search_changed)
+        self.search_input.textChanged.connect(lambda text: self.debounce_timer.start())
+        
         # Advanced search button
         self.advanced_btn = QPushButton("Advanced")
         self.advanced_btn.clicked.connect(self.advanced_search_requested.emit)
@@ -999,6 +1320,10 @@ class QuickSearchWidget(QWidget):
         
         self.setLayout(layout)
     
+    def emit_search_changed(self):
+        """Emit the search text once typing has paused"""
+        self.search_changed.emit(self.search_input.text())
+    
     def clear_search(self):
         """Clear the search input"""
         self.search_input.clear()
@@ -3,6 +3,7 @@ Styles module for the application.
 Contains color schemes and styling for the application components.
 """
 from enum import Enum
+from functools import lru_cache
 from PySide6.QtGui import QColor, QPalette, QFont
 from PySide6.QtCore import Qt
 
@@ -43,7 +44,9 @@ class Colors:
 
 
 class StyleSheet:
+    # Themes are static, so each stylesheet is built once per theme and cached
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_main_style(theme=Theme.LIGHT):
         if theme == Theme.DARK:
             return f"""
@@ -234,6 +237,7 @@ class StyleSheet:
             """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_login_style(theme=Theme.LIGHT):
         if theme == Theme.DARK:
             return f"""
@@ -319,6 +323,7 @@ class StyleSheet:
             """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_sidebar_style(theme=Theme.LIGHT):
         if theme == Theme.DARK:
             return f"""
@@ -379,8 +384,9 @@ class StyleSheet:
             """
 
 
-def set_application_palette(app, theme=Theme.LIGHT):
-    """Set application color palette based on theme"""
+@lru_cache(maxsize=None)
+def build_palette(theme=Theme.LIGHT):
+    """Build the color palette for a theme; built once per theme, after the QApplication exists"""
     palette = QPalette()
     
     if theme == Theme.DARK:
@@ -418,4 +424,9 @@ def set_application_palette(app, theme=Theme.LIGHT):
         palette.setColor(QPalette.Disabled, QPalette.Text, QColor(Colors.LIGHT_DISABLED))
         palette.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(Colors.LIGHT_DISABLED))
     
-    app.setPalette(palette)
\ No newline at end of file
+    return palette
+
+
+def set_application_palette(app, theme=Theme.LIGHT):
+    """Set application color palette based on theme"""
+    app.setPalette(build_palette(theme))
\ No newline at end of file
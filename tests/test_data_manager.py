@@ -0,0 +1,66 @@
+"""
+Tests for DataManager's JSON Lines storage.
+"""
+import os
+
+import pytest
+
+from utils import DataManager, DEFAULT_SALES_FILE
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Run each test in an empty working directory with its own data folder"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "data"
+
+
+def sales_path():
+    return DataManager.get_file_path(DEFAULT_SALES_FILE)
+
+
+def test_partial_last_line_keeps_earlier_records(data_dir):
+    DataManager.append_record({"id": "1"}, DEFAULT_SALES_FILE)
+    DataManager.append_record({"id": "2"}, DEFAULT_SALES_FILE)
+    with open(sales_path(), "ab") as f:
+        f.write(b'{"id": "3", "tot')
+    
+    data, error = DataManager.load_data(DEFAULT_SALES_FILE)
+    
+    assert error == ""
+    assert [sale["id"] for sale in data] == ["1", "2"]
+
+
+def test_append_after_partial_last_line_drops_it(data_dir):
+    DataManager.append_record({"id": "1"}, DEFAULT_SALES_FILE)
+    with open(sales_path(), "ab") as f:
+        f.write(b'{"id": "2", "tot')
+    
+    success, error = DataManager.append_record({"id": "3"}, DEFAULT_SALES_FILE)
+    data, load_error = DataManager.load_data(DEFAULT_SALES_FILE)
+    
+    assert success and error == ""
+    assert load_error == ""
+    assert [sale["id"] for sale in data] == ["1", "3"]
+
+
+def test_append_after_complete_line_without_newline_keeps_it(data_dir):
+    with open(sales_path(), "wb") as f:
+        f.write(b'{"id": "1"}')
+    
+    DataManager.append_record({"id": "2"}, DEFAULT_SALES_FILE)
+    data, error = DataManager.load_data(DEFAULT_SALES_FILE)
+    
+    assert error == ""
+    assert [sale["id"] for sale in data] == ["1", "2"]
+
+
+def test_damaged_line_before_the_end_is_an_error(data_dir):
+    with open(sales_path(), "wb") as f:
+        f.write(b'{"id": "1"}\n{"id": \n{"id": "3"}\n')
+    
+    data, error = DataManager.load_data(DEFAULT_SALES_FILE)
+    
+    assert data == []
+    assert "JSON decode error" in error
+    assert os.path.getsize(sales_path()) > 0
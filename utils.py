@@ -4,13 +4,25 @@ Utility functions for the application.
 import os
 import json
 import hashlib
+import hmac
+import itertools
 import logging
+import time
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 from PySide6.QtWidgets import QMessageBox
 from PySide6.QtGui import QIcon
 from PySide6.QtCore import QSettings
 
+# orjson parses and serializes JSON in C and is much faster on large data
+# files; fall back to the standard library when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Constants
 APP_NAME = "ZERO"
 APP_VERSION = "1.0.0"
@@ -18,30 +30,37 @@ DEFAULT_SETTINGS_FILE = "settings.json"
 DEFAULT_USERS_FILE = "users.json"
 DEFAULT_CUSTOMERS_FILE = "customers.json"
 DEFAULT_PRODUCTS_FILE = "products.json"
-DEFAULT_SALES_FILE = "sales.json"
-DEFAULT_EXPENSES_FILE = "expenses.json"
+DEFAULT_SALES_FILE = "sales.jsonl"
+DEFAULT_EXPENSES_FILE = "expenses.jsonl"
 DEFAULT_NOTIFICATIONS_FILE = "notifications.json"
-DEFAULT_MOVEMENTS_FILE = "movements.json"
-DEFAULT_PAYMENTS_FILE = "payments.json"
+DEFAULT_MOVEMENTS_FILE = "movements.jsonl"
+DEFAULT_PAYMENTS_FILE = "payments.jsonl"
 
 # User types
 USER_TYPE_ADMIN = "admin"
 USER_TYPE_SALESMAN = "salesman"
+USER_TYPES = frozenset({USER_TYPE_ADMIN, USER_TYPE_SALESMAN})
 
 
 class DataManager:
     """Class to manage data operations like save, load, etc."""
     
-    # Set up logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('data/app.log'),
-            logging.StreamHandler()
-        ]
-    )
     logger = logging.getLogger(__name__)
+    _logging_configured = False
+    
+    # Parsed files shared by read-only callers: filename -> ((mtime_ns, size), data, groups)
+    _cache = {}
+    _id_counter = itertools.count()
+    
+    # Files holding a list of records with an 'id': filename -> (plural, singular) labels for errors
+    RECORD_FILES = {
+        DEFAULT_CUSTOMERS_FILE: ("Customers", "customer"),
+        DEFAULT_PRODUCTS_FILE: ("Products", "product"),
+        DEFAULT_SALES_FILE: ("Sales", "sale"),
+        DEFAULT_EXPENSES_FILE: ("Expenses", "expense"),
+        DEFAULT_MOVEMENTS_FILE: ("Movements", "movement"),
+        DEFAULT_PAYMENTS_FILE: ("Payments", "payment"),
+    }
     
     @staticmethod
     def ensure_data_dir():
@@ -53,57 +72,89 @@ class DataManager:
             DataManager.logger.error(f"Failed to create data directory: {e}")
             return False
     
+    @staticmethod
+    def setup_logging():
+        """Send log output to data/app.log and the console, once the data directory exists"""
+        if DataManager._logging_configured:
+            return
+        DataManager.ensure_data_dir()
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler(os.path.join("data", "app.log")),
+                logging.StreamHandler()
+            ]
+        )
+        DataManager._logging_configured = True
+    
     @staticmethod
     def get_file_path(filename: str) -> str:
         """Get the full path to a data file"""
         DataManager.ensure_data_dir()
         return os.path.join("data", filename)
+    
+    @staticmethod
+    def get_file_mtime(filename: str) -> Optional[int]:
+        """Get the modification time of a data file in nanoseconds, or None if it doesn't exist"""
+        try:
+            return os.stat(DataManager.get_file_path(filename)).st_mtime_ns
+        except OSError:
+            return None
+    
+    @staticmethod
+    def is_jsonl_file(filename: str) -> bool:
+        """Check whether a data file is stored as JSON Lines (one record per line)"""
+        return filename.endswith(".jsonl")
+    
+    @staticmethod
+    def encode_record(record: Any) -> bytes:
+        """Encode a single record as one JSON line"""
+        if orjson:
+            return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+        return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+    
+    @staticmethod
+    def write_file_atomic(file_path: str, raw: bytes) -> None:
+        """Write a file in one call through a temporary file so a crash never leaves it half written"""
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    @staticmethod
+    def migrate_legacy_json(filename: str) -> None:
+        """Convert the old JSON array file of a JSON Lines data file, if only the old one exists"""
+        file_path = DataManager.get_file_path(filename)
+        legacy_path = file_path[:-1]
+        if os.path.exists(file_path) or not os.path.exists(legacy_path):
+            return
+        
+        with open(legacy_path, 'rb') as f:
+            raw = f.read()
+        records = orjson.loads(raw) if orjson else json.loads(raw)
+        DataManager.write_file_atomic(file_path, b"".join(DataManager.encode_record(record) for record in records))
+        DataManager.logger.info("Migrated %s to %s", os.path.basename(legacy_path), filename)
 
     @staticmethod
     def validate_json_structure(data: Any, filename: str) -> Tuple[bool, str]:
         """Validate JSON data structure based on file type"""
         try:
-            if filename == DEFAULT_CUSTOMERS_FILE:
+            if filename in DataManager.RECORD_FILES:
+                plural, singular = DataManager.RECORD_FILES[filename]
                 if not isinstance(data, list):
-                    return False, "Customers data must be a list"
-                for item in data:
-                    if not isinstance(item, dict) or 'id' not in item:
-                        return False, "Each customer must be a dictionary with an 'id' field"
-            
-            elif filename == DEFAULT_PRODUCTS_FILE:
-                if not isinstance(data, list):
-                    return False, "Products data must be a list"
-                for item in data:
-                    if not isinstance(item, dict) or 'id' not in item:
-                        return False, "Each product must be a dictionary with an 'id' field"
-            
-            elif filename == DEFAULT_SALES_FILE:
-                if not isinstance(data, list):
-                    return False, "Sales data must be a list"
-                for item in data:
-                    if not isinstance(item, dict) or 'id' not in item:
-                        return False, "Each sale must be a dictionary with an 'id' field"
-            
-            elif filename == DEFAULT_EXPENSES_FILE:
-                if not isinstance(data, list):
-                    return False, "Expenses data must be a list"
-                for item in data:
-                    if not isinstance(item, dict) or 'id' not in item:
-                        return False, "Each expense must be a dictionary with an 'id' field"
-            
-            elif filename == DEFAULT_MOVEMENTS_FILE:
-                if not isinstance(data, list):
-                    return False, "Movements data must be a list"
-                for item in data:
-                    if not isinstance(item, dict) or 'id' not in item:
-                        return False, "Each movement must be a dictionary with an 'id' field"
-            
-            elif filename == DEFAULT_PAYMENTS_FILE:
-                if not isinstance(data, list):
-                    return False, "Payments data must be a list"
-                for item in data:
-                    if not isinstance(item, dict) or 'id' not in item:
-                        return False, "Each payment must be a dictionary with an 'id' field"
+                    return False, f"{plural} data must be a list"
+                if not all(isinstance(item, dict) and 'id' in item for item in data):
+                    return False, f"Each {singular} must be a dictionary with an 'id' field"
             
             elif filename == DEFAULT_USERS_FILE:
                 if not isinstance(data, dict):
@@ -129,18 +180,113 @@ class DataManager:
                 return False, f"Data validation failed: {error_msg}"
             
             # Save data
+            DataManager._cache.pop(filename, None)
             file_path = DataManager.get_file_path(filename)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            # Serialize before writing so an encoding error leaves the file intact
+            if DataManager.is_jsonl_file(filename):
+                raw = b"".join(DataManager.encode_record(record) for record in data)
+            elif orjson:
+                raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                raw = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+            DataManager.write_file_atomic(file_path, raw)
             
-            DataManager.logger.info(f"Data saved successfully to {filename}")
+            DataManager.logger.info("Data saved successfully to %s", filename)
             return True, ""
             
         except PermissionError as e:
             error_msg = f"Permission denied when saving {filename}: {e}"
             DataManager.logger.error(error_msg)
             return False, error_msg
-        except json.JSONEncodeError as e:
+        except (TypeError, ValueError) as e:
+            error_msg = f"JSON encoding error when saving {filename}: {e}"
+            DataManager.logger.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Unexpected error saving {filename}: {e}"
+            DataManager.logger.error(error_msg)
+            return False, error_msg
+    
+    @staticmethod
+    def end_last_line(f, filename: str) -> None:
+        """
+        Make sure a JSON Lines file opened for appending ends with a complete line
+        
+        A last line without a newline is either a record written without one, which
+        gets its newline, or the remains of an interrupted append, which is cut off
+        so the next record doesn't run into it.
+        """
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        
+        # Find the start of the unterminated last line
+        start = end
+        while start > 0:
+            step = min(4096, start)
+            f.seek(start - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                start = start - step + newline + 1
+                break
+            start -= step
+        
+        f.seek(start)
+        tail = f.read()
+        try:
+            (orjson.loads if orjson else json.loads)(tail)
+        except ValueError:
+            DataManager.logger.warning("Dropping incomplete last line of %s", filename)
+            f.truncate(start)
+        else:
+            f.write(b"\n")
+    
+    @staticmethod
+    def append_record(record: Dict[str, Any], filename: str) -> Tuple[bool, str]:
+        """
+        Append a single record to a JSON Lines data file without rewriting it
+        
+        Returns:
+            Tuple of (success, error_message)
+        """
+        return DataManager.append_records([record], filename)
+    
+    @staticmethod
+    def append_records(records: List[Dict[str, Any]], filename: str) -> Tuple[bool, str]:
+        """
+        Append records to a JSON Lines data file in a single write without rewriting it
+        
+        Returns:
+            Tuple of (success, error_message)
+        """
+        try:
+            is_valid, error_msg = DataManager.validate_json_structure(records, filename)
+            if not is_valid:
+                DataManager.logger.error(f"Data validation failed for {filename}: {error_msg}")
+                return False, f"Data validation failed: {error_msg}"
+            
+            DataManager.migrate_legacy_json(filename)
+            DataManager._cache.pop(filename, None)
+            # Encode everything first so an encoding error appends nothing
+            lines = b"".join(DataManager.encode_record(record) for record in records)
+            with open(DataManager.get_file_path(filename), 'a+b') as f:
+                DataManager.end_last_line(f, filename)
+                f.write(lines)
+            
+            if len(records) == 1:
+                DataManager.logger.info("Record appended successfully to %s", filename)
+            else:
+                DataManager.logger.info("%d records appended successfully to %s", len(records), filename)
+            return True, ""
+            
+        except PermissionError as e:
+            error_msg = f"Permission denied when saving {filename}: {e}"
+            DataManager.logger.error(error_msg)
+            return False, error_msg
+        except (TypeError, ValueError) as e:
             error_msg = f"JSON encoding error when saving {filename}: {e}"
             DataManager.logger.error(error_msg)
             return False, error_msg
@@ -160,15 +306,33 @@ class DataManager:
         """
         try:
             file_path = DataManager.get_file_path(filename)
+            if DataManager.is_jsonl_file(filename):
+                DataManager.migrate_legacy_json(filename)
             
             if not os.path.exists(file_path):
                 # Return appropriate default structure
                 default_data = DataManager.get_default_data_structure(filename)
-                DataManager.logger.info(f"File {filename} doesn't exist, returning default structure")
+                DataManager.logger.info("File %s doesn't exist, returning default structure", filename)
                 return default_data, ""
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if DataManager.is_jsonl_file(filename):
+                loads = orjson.loads if orjson else json.loads
+                with open(file_path, 'rb') as f:
+                    lines = [line for line in f if line.strip()]
+                data = []
+                for number, line in enumerate(lines, 1):
+                    try:
+                        data.append(loads(line))
+                    except ValueError:
+                        # A crash during an append can leave the last line half written;
+                        # keep the records before it and only fail on damage earlier in the file
+                        if number < len(lines):
+                            raise
+                        DataManager.logger.warning("Skipping incomplete last line of %s", filename)
+            else:
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson else json.loads(raw)
             
             # Validate loaded data
             is_valid, error_msg = DataManager.validate_json_structure(data, filename)
@@ -177,7 +341,7 @@ class DataManager:
                 default_data = DataManager.get_default_data_structure(filename)
                 return default_data, f"Data corrupted: {error_msg}"
             
-            DataManager.logger.info(f"Data loaded successfully from {filename}")
+            DataManager.logger.info("Data loaded successfully from %s", filename)
             return data, ""
             
         except json.JSONDecodeError as e:
@@ -196,6 +360,55 @@ class DataManager:
             default_data = DataManager.get_default_data_structure(filename)
             return default_data, error_msg
     
+    @staticmethod
+    def load_cached(filename: str) -> Tuple[Any, str]:
+        """
+        Load data like load_data, reusing the parsed data while the file is unchanged
+        
+        The returned data is shared between callers and must not be modified.
+        """
+        if DataManager.is_jsonl_file(filename):
+            DataManager.migrate_legacy_json(filename)
+        
+        try:
+            stat = os.stat(DataManager.get_file_path(filename))
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        
+        cached = DataManager._cache.get(filename)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            return cached[1], ""
+        
+        data, error = DataManager.load_data(filename)
+        if not error and stamp is not None:
+            DataManager._cache[filename] = (stamp, data, {})
+        return data, error
+    
+    @staticmethod
+    def load_grouped(filename: str, field: str) -> Tuple[Dict[Any, List[Dict[str, Any]]], str]:
+        """
+        Load records grouped by the value of one field, e.g. sales by customer_id
+        
+        The groups are kept with the cached file data and share its records,
+        so they must not be modified either.
+        """
+        data, error = DataManager.load_cached(filename)
+        if error:
+            return {}, error
+        
+        cached = DataManager._cache.get(filename)
+        if cached is not None and cached[1] is data and field in cached[2]:
+            return cached[2][field], ""
+        
+        groups = defaultdict(list)
+        for record in data:
+            groups[record.get(field)].append(record)
+        groups = dict(groups)
+        if cached is not None and cached[1] is data:
+            cached[2][field] = groups
+        return groups, ""
+    
     @staticmethod
     def get_default_data_structure(filename: str) -> Any:
         """Get default data structure for a given file"""
@@ -216,11 +429,13 @@ class DataManager:
     @staticmethod
     def generate_id() -> str:
         """Generate a unique ID for records"""
-        return f"id_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        # Nanosecond clock plus a wrapping counter so ids made within one clock tick stay unique
+        return f"id_{time.time_ns():016x}{next(DataManager._id_counter) & 0xFFFF:04x}"
     
     @staticmethod
     def init_data_files():
         """Initialize all data files with default structure if they don't exist"""
+        DataManager.setup_logging()
         try:
             # Settings file
             if not os.path.exists(DataManager.get_file_path(DEFAULT_SETTINGS_FILE)):
@@ -236,7 +451,7 @@ class DataManager:
             # Users file
             if not os.path.exists(DataManager.get_file_path(DEFAULT_USERS_FILE)):
                 # Create default admin user
-                password = hashlib.sha256("admin".encode()).hexdigest()
+                password = UserManager.hash_password("admin")
                 users = {
                     "admin": {
                         "password": password,
@@ -252,6 +467,8 @@ class DataManager:
             # Initialize other data files
             for filename in [DEFAULT_CUSTOMERS_FILE, DEFAULT_PRODUCTS_FILE, 
                            DEFAULT_SALES_FILE, DEFAULT_EXPENSES_FILE, DEFAULT_NOTIFICATIONS_FILE, DEFAULT_MOVEMENTS_FILE, DEFAULT_PAYMENTS_FILE]:
+                if DataManager.is_jsonl_file(filename):
+                    DataManager.migrate_legacy_json(filename)
                 if not os.path.exists(DataManager.get_file_path(filename)):
                     success, error = DataManager.save_data([], filename)
                     if not success:
@@ -267,6 +484,47 @@ class DataManager:
 class UserManager:
     """Class to manage user operations"""
     
+    # scrypt cost parameters for stored passwords
+    SCRYPT_N = 2 ** 14
+    SCRYPT_R = 8
+    SCRYPT_P = 1
+    
+    @staticmethod
+    def hash_password(password: str) -> str:
+        """Hash a password with a random salt as 'scrypt$<salt hex>$<hash hex>'"""
+        salt = os.urandom(16)
+        digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=UserManager.SCRYPT_N,
+                                r=UserManager.SCRYPT_R, p=UserManager.SCRYPT_P, dklen=32)
+        return f"scrypt${salt.hex()}${digest.hex()}"
+    
+    @staticmethod
+    def verify_password(password: str, stored_password: str) -> bool:
+        """Check a password against a stored scrypt hash or a legacy unsalted SHA-256 hex digest"""
+        if stored_password.startswith("scrypt$"):
+            try:
+                _, salt_hex, hash_hex = stored_password.split("$")
+                salt = bytes.fromhex(salt_hex)
+                expected = bytes.fromhex(hash_hex)
+            except ValueError:
+                return False
+            digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=UserManager.SCRYPT_N,
+                                    r=UserManager.SCRYPT_R, p=UserManager.SCRYPT_P, dklen=len(expected))
+            return hmac.compare_digest(digest, expected)
+        
+        hashed_password = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(hashed_password, stored_password)
+    
+    @staticmethod
+    def upgrade_password_hash(username: str, password: str) -> None:
+        """Replace a user's legacy SHA-256 password hash with a salted scrypt hash"""
+        users, error = DataManager.load_data(DEFAULT_USERS_FILE)
+        if error or username not in users:
+            return
+        users[username]["password"] = UserManager.hash_password(password)
+        success, save_error = DataManager.save_data(users, DEFAULT_USERS_FILE)
+        if not success:
+            DataManager.logger.warning(f"Failed to upgrade password hash for {username}: {save_error}")
+    
     @staticmethod
     def authenticate(username: str, password: str) -> Optional[Dict[str, Any]]:
         """
@@ -280,17 +538,18 @@ class UserManager:
             User data dictionary if authentication successful, None otherwise
         """
         try:
-            users, error = DataManager.load_data(DEFAULT_USERS_FILE)
+            users, error = DataManager.load_cached(DEFAULT_USERS_FILE)
             if error:
                 DataManager.logger.error(f"Failed to load users for authentication: {error}")
                 return None
             
             if username in users:
                 stored_password = users[username].get("password", "")
-                hashed_password = hashlib.sha256(password.encode()).hexdigest()
-                if stored_password == hashed_password:
+                if UserManager.verify_password(password, stored_password):
                     user_data = users[username].copy()
                     user_data["username"] = username
+                    if not stored_password.startswith("scrypt$"):
+                        UserManager.upgrade_password_hash(username, password)
                     DataManager.logger.info(f"User {username} authenticated successfully")
                     return user_data
             
@@ -323,7 +582,7 @@ class UserManager:
             if not password or len(password) < 4:
                 return False, "Password must be at least 4 characters long"
             
-            if user_type not in [USER_TYPE_ADMIN, USER_TYPE_SALESMAN]:
+            if user_type not in USER_TYPES:
                 return False, f"User type must be {USER_TYPE_ADMIN} or {USER_TYPE_SALESMAN}"
             
             if not name or not name.strip():
@@ -336,7 +595,7 @@ class UserManager:
             if username in users:
                 return False, "Username already exists"
             
-            hashed_password = hashlib.sha256(password.encode()).hexdigest()
+            hashed_password = UserManager.hash_password(password)
             users[username] = {
                 "password": hashed_password,
                 "type": user_type,
@@ -380,7 +639,7 @@ class UserManager:
             if username not in users:
                 return False, "User does not exist"
             
-            hashed_password = hashlib.sha256(new_password.encode()).hexdigest()
+            hashed_password = UserManager.hash_password(new_password)
             users[username]["password"] = hashed_password
             
             success, save_error = DataManager.save_data(users, DEFAULT_USERS_FILE)
@@ -492,13 +751,15 @@ class AppSettings:
         self.settings.setValue("last_user", username)
 
 
+@lru_cache(maxsize=2048)
 def format_currency(amount):
-    """Format amount as currency"""
+    """Format amount as currency; cached since tables repeat the same prices"""
     return f"${amount:.2f}"
 
 
+@lru_cache(maxsize=4096)
 def format_date(date_str, output_format="%d/%m/%Y"):
-    """Format date string"""
+    """Format date string; cached since tables repeat the same timestamps"""
     if isinstance(date_str, str):
         date_obj = datetime.fromisoformat(date_str)
         return date_obj.strftime(output_format)
@@ -509,41 +770,49 @@ class PaymentManager:
     """Class to manage customer payments and debt tracking"""
     
     @staticmethod
-    def calculate_customer_debt(customer_id):
+    def calculate_customer_debt(customer_id, sales_data=None, payments_data=None):
         """
         Calculate total debt for a customer based on credit sales
         
         Args:
             customer_id: Customer ID to calculate debt for
+            sales_data: Already loaded sales, loaded from disk when None
+            payments_data: Already loaded payments, loaded from disk when None
             
         Returns:
             Tuple of (total_debt, total_payments, outstanding_balance)
         """
         try:
-            # Load sales data
-            sales_data, sales_error = DataManager.load_data(DEFAULT_SALES_FILE)
-            if sales_error:
-                DataManager.logger.error(f"Failed to load sales data: {sales_error}")
-                return 0.0, 0.0, 0.0
-            
-            # Load payments data
-            payments_data, payments_error = DataManager.load_data(DEFAULT_PAYMENTS_FILE)
-            if payments_error:
-                DataManager.logger.error(f"Failed to load payments data: {payments_error}")
-                return 0.0, 0.0, 0.0
+            # Load the customer's sales, from the per-customer index unless given
+            if sales_data is None:
+                sales_by_customer, sales_error = DataManager.load_grouped(DEFAULT_SALES_FILE, "customer_id")
+                if sales_error:
+                    DataManager.logger.error(f"Failed to load sales data: {sales_error}")
+                    return 0.0, 0.0, 0.0
+                customer_sales = sales_by_customer.get(customer_id, [])
+            else:
+                customer_sales = [sale for sale in sales_data if sale.get("customer_id") == customer_id]
+            
+            # Load the customer's payments
+            if payments_data is None:
+                payments_by_customer, payments_error = DataManager.load_grouped(DEFAULT_PAYMENTS_FILE, "customer_id")
+                if payments_error:
+                    DataManager.logger.error(f"Failed to load payments data: {payments_error}")
+                    return 0.0, 0.0, 0.0
+                customer_payments = payments_by_customer.get(customer_id, [])
+            else:
+                customer_payments = [payment for payment in payments_data if payment.get("customer_id") == customer_id]
             
             # Calculate total debt from credit sales
             total_debt = 0.0
-            for sale in sales_data:
-                if (sale.get("customer_id") == customer_id and 
-                    sale.get("payment_method") == "Credit (Account)"):
+            for sale in customer_sales:
+                if sale.get("payment_method") == "Credit (Account)":
                     total_debt += sale.get("total", 0.0)
             
             # Calculate total payments
             total_payments = 0.0
-            for payment in payments_data:
-                if payment.get("customer_id") == customer_id:
-                    total_payments += payment.get("amount", 0.0)
+            for payment in customer_payments:
+                total_payments += payment.get("amount", 0.0)
             
             # Calculate outstanding balance
             outstanding_balance = total_debt - total_payments
@@ -580,11 +849,6 @@ class PaymentManager:
             if not payment_method:
                 return False, "Payment method is required"
             
-            # Load payments data
-            payments_data, error = DataManager.load_data(DEFAULT_PAYMENTS_FILE)
-            if error:
-                return False, f"Failed to load payments data: {error}"
-            
             # Create payment record
             payment_record = {
                 "id": DataManager.generate_id(),
@@ -598,11 +862,8 @@ class PaymentManager:
                 "created_at": datetime.now().isoformat()
             }
             
-            # Add payment to list
-            payments_data.append(payment_record)
-            
-            # Save payments data
-            success, save_error = DataManager.save_data(payments_data, DEFAULT_PAYMENTS_FILE)
+            # Append the payment to the payments file
+            success, save_error = DataManager.append_record(payment_record, DEFAULT_PAYMENTS_FILE)
             if success:
                 DataManager.logger.info(f"Payment recorded for customer {customer_id}: ${amount}")
                 return True, ""
@@ -626,13 +887,13 @@ class PaymentManager:
             List of payment records sorted by date (newest first)
         """
         try:
-            payments_data, error = DataManager.load_data(DEFAULT_PAYMENTS_FILE)
+            payments_by_customer, error = DataManager.load_grouped(DEFAULT_PAYMENTS_FILE, "customer_id")
             if error:
                 DataManager.logger.error(f"Failed to load payments data: {error}")
                 return []
             
-            # Filter payments for the customer
-            customer_payments = [p for p in payments_data if p.get("customer_id") == customer_id]
+            # Copy the customer's payments so sorting leaves the shared index alone
+            customer_payments = list(payments_by_customer.get(customer_id, []))
             
             # Sort by date (newest first)
             customer_payments.sort(key=lambda x: x.get("created_at", ""), reverse=True)
@@ -653,16 +914,38 @@ class PaymentManager:
         """
         try:
             # Load customers data
-            customers_data, customers_error = DataManager.load_data(DEFAULT_CUSTOMERS_FILE)
+            customers_data, customers_error = DataManager.load_cached(DEFAULT_CUSTOMERS_FILE)
             if customers_error:
                 DataManager.logger.error(f"Failed to load customers data: {customers_error}")
                 return {}
             
+            # Balances read as zero when either file cannot be loaded
+            sales_data, sales_error = DataManager.load_cached(DEFAULT_SALES_FILE)
+            payments_data, payments_error = DataManager.load_cached(DEFAULT_PAYMENTS_FILE)
+            if sales_error:
+                DataManager.logger.error(f"Failed to load sales data: {sales_error}")
+            if payments_error:
+                DataManager.logger.error(f"Failed to load payments data: {payments_error}")
+            if sales_error or payments_error:
+                sales_data, payments_data = [], []
+            
+            # Total credit sales and payments per customer in one pass over each file
+            debt_by_customer = defaultdict(float)
+            for sale in sales_data:
+                if sale.get("payment_method") == "Credit (Account)":
+                    debt_by_customer[sale.get("customer_id")] += sale.get("total", 0.0)
+            
+            payments_by_customer = defaultdict(float)
+            for payment in payments_data:
+                payments_by_customer[payment.get("customer_id")] += payment.get("amount", 0.0)
+            
             balances = {}
             for customer in customers_data:
                 customer_id = customer.get("id")
                 if customer_id:
-                    total_debt, total_payments, outstanding_balance = PaymentManager.calculate_customer_debt(customer_id)
+                    total_debt = debt_by_customer.get(customer_id, 0.0)
+                    total_payments = payments_by_customer.get(customer_id, 0.0)
+                    outstanding_balance = total_debt - total_payments
                     balances[customer_id] = {
                         "total_debt": total_debt,
                         "total_payments": total_payments,
@@ -680,33 +963,31 @@ class MovementManager:
     """Class to manage inventory movements"""
     
     @staticmethod
-    def create_sale_movement(sale_data, user_data):
+    def create_sale_movement(sale_data, user_data, products=None):
         """
         Create inventory movement records for a sale transaction
         
         Args:
             sale_data: Sale transaction data
             user_data: User who made the sale
+            products: Already loaded products, loaded from disk when None
             
         Returns:
             Tuple of (success, error_message)
         """
         try:
-            # Load current movements
-            movements, error = DataManager.load_data(DEFAULT_MOVEMENTS_FILE)
-            if error:
-                return False, f"Failed to load movements: {error}"
-            
             # Load products to get product details
-            products, products_error = DataManager.load_data(DEFAULT_PRODUCTS_FILE)
-            if products_error:
-                return False, f"Failed to load products: {products_error}"
+            if products is None:
+                products, products_error = DataManager.load_cached(DEFAULT_PRODUCTS_FILE)
+                if products_error:
+                    return False, f"Failed to load products: {products_error}"
             
             # Create product lookup
             product_lookup = {p.get("id"): p for p in products}
             
             # Create movement records for each item in the sale
             new_movements = []
+            created_at = datetime.now().isoformat()
             
             for item in sale_data.get("items", []):
                 product_id = item.get("product_id")
@@ -727,15 +1008,12 @@ class MovementManager:
                         "notes": f"Sale to {sale_data.get('customer_name', 'Walk-in Customer')}",
                         "created_by": user_data.get("username", ""),
                         "created_by_name": user_data.get("name", ""),
-                        "created_at": datetime.now().isoformat()
+                        "created_at": created_at
                     }
                     new_movements.append(movement_record)
             
-            # Add new movements to the list
-            movements.extend(new_movements)
-            
-            # Save updated movements
-            success, save_error = DataManager.save_data(movements, DEFAULT_MOVEMENTS_FILE)
+            # Append the new movements to the movements file
+            success, save_error = DataManager.append_records(new_movements, DEFAULT_MOVEMENTS_FILE)
             if success:
                 DataManager.logger.info(f"Created {len(new_movements)} movement records for sale {sale_data.get('id')}")
                 return True, ""
@@ -763,44 +1041,42 @@ class MovementManager:
             Tuple of (success, error_message)
         """
         try:
-            # Load movements and products
-            movements, movements_error = DataManager.load_data(DEFAULT_MOVEMENTS_FILE)
-            if movements_error:
-                return False, f"Failed to load movements: {movements_error}"
-            
-            products, products_error = DataManager.load_data(DEFAULT_PRODUCTS_FILE)
+            # Find the product through the cached products indexed by id
+            products_by_id, products_error = DataManager.load_grouped(DEFAULT_PRODUCTS_FILE, "id")
             if products_error:
                 return False, f"Failed to load products: {products_error}"
             
-            # Find the product
-            product = next((p for p in products if p.get("id") == product_id), None)
+            product = next(iter(products_by_id.get(product_id, ())), None)
             if not product:
                 return False, "Product not found"
             
-            # Create movement record
+            # Create movement record, with both timestamps taken from the same instant
+            now = datetime.now()
+            if quantity_change > 0:
+                movement_type, quantity = "in", quantity_change
+            else:
+                movement_type, quantity = "out", abs(quantity_change)
+            buying_price = product.get("buying_price", 0.0)
             movement_record = {
                 "id": DataManager.generate_id(),
                 "product_id": product_id,
                 "product_name": product.get("name", "Unknown"),
-                "movement_type": "in" if quantity_change > 0 else "out",
-                "quantity": abs(quantity_change),
-                "unit_price": product.get("buying_price", 0.0),
-                "total_value": abs(quantity_change) * product.get("buying_price", 0.0),
+                "movement_type": movement_type,
+                "quantity": quantity,
+                "unit_price": buying_price,
+                "total_value": quantity * buying_price,
                 "reference_type": "adjustment",
                 "reference_id": None,
-                "reference_number": f"ADJ-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                "reference_number": f"ADJ-{now.strftime('%Y%m%d%H%M%S')}",
                 "adjustment_type": adjustment_type,
                 "notes": notes or "",
                 "created_by": user_data.get("username", ""),
                 "created_by_name": user_data.get("name", ""),
-                "created_at": datetime.now().isoformat()
+                "created_at": now.isoformat()
             }
             
-            # Add movement to list
-            movements.append(movement_record)
-            
-            # Save movements
-            success, save_error = DataManager.save_data(movements, DEFAULT_MOVEMENTS_FILE)
+            # Append the movement to the movements file
+            success, save_error = DataManager.append_record(movement_record, DEFAULT_MOVEMENTS_FILE)
             if success:
                 DataManager.logger.info(f"Stock adjustment recorded for product {product_id}: {quantity_change}")
                 return True, ""
@@ -825,21 +1101,23 @@ class MovementManager:
             List of movement records sorted by date (newest first)
         """
         try:
-            movements, error = DataManager.load_data(DEFAULT_MOVEMENTS_FILE)
+            movements_by_product, error = DataManager.load_grouped(DEFAULT_MOVEMENTS_FILE, "product_id")
             if error:
                 DataManager.logger.error(f"Failed to load movements: {error}")
                 return []
             
-            # Filter movements for the product
-            product_movements = [m for m in movements if m.get("product_id") == product_id]
-            
-            # Filter by date if specified
-            if days:
-                cutoff_date = datetime.now() - timedelta(days=days)
-                product_movements = [
-                    m for m in product_movements 
-                    if datetime.fromisoformat(m.get("created_at", "")) >= cutoff_date
-                ]
+            # Take the product's movements, filtered by date in the same pass if specified
+            cutoff_date = datetime.now() - timedelta(days=days) if days else None
+            product_movements = []
+            for m in movements_by_product.get(product_id, []):
+                if cutoff_date is not None:
+                    try:
+                        if datetime.fromisoformat(m.get("created_at", "")) < cutoff_date:
+                            continue
+                    except (TypeError, ValueError):
+                        # Skip movements without a usable date instead of failing the whole history
+                        continue
+                product_movements.append(m)
             
             # Sort by date (newest first)
             product_movements.sort(key=lambda x: x.get("created_at", ""), reverse=True)
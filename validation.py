@@ -2,11 +2,21 @@
 Data validation module for the ZERO application.
 Provides comprehensive validation functions for all data types.
 """
+import numbers
 import re
 from datetime import datetime
+from decimal import Decimal
 from typing import Tuple, Optional, Any
 
 
+# Patterns compiled once instead of on every validation call
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_CLEAN_RE = re.compile(r'[\s\-\(\)\+]')
+
+# Any real number type, including numpy scalars; Decimal is not registered as numbers.Real
+_NUMBER_TYPES = (numbers.Real, Decimal)
+
+
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     pass
@@ -34,9 +44,7 @@ class Validator:
             return True, ""
         
         # Basic email regex pattern
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        
-        if not re.match(pattern, email):
+        if not _EMAIL_RE.match(email):
             return False, "Invalid email format"
         
         if len(email) > 254:  # RFC 5321 limit
@@ -63,7 +71,7 @@ class Validator:
             return True, ""
         
         # Remove common separators and spaces
-        cleaned_phone = re.sub(r'[\s\-\(\)\+]', '', phone)
+        cleaned_phone = _PHONE_CLEAN_RE.sub('', phone)
         
         # Check if it contains only digits after cleaning
         if not cleaned_phone.isdigit():
@@ -89,11 +97,10 @@ class Validator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if not value or not value.strip():
+        value = value.strip() if value else value
+        if not value:
             return False, f"{field_name} is required"
         
-        value = value.strip()
-        
         if len(value) < min_length:
             return False, f"{field_name} must be at least {min_length} characters long"
         
@@ -143,6 +150,10 @@ class Validator:
         if value is None:
             return False, f"{field_name} is required"
         
+        # Values from forms or files may be strings, which can't be compared with numbers
+        if not isinstance(value, _NUMBER_TYPES):
+            return False, f"{field_name} must be a number"
+        
         if allow_zero and value < 0:
             return False, f"{field_name} must be zero or positive"
         elif not allow_zero and value <= 0:
@@ -171,6 +182,9 @@ class Validator:
         if value is None:
             return False, f"{field_name} is required"
         
+        if not isinstance(value, _NUMBER_TYPES):
+            return False, f"{field_name} must be a number"
+        
         if value < min_value:
             return False, f"{field_name} must be at least {min_value}"
         
@@ -232,7 +246,7 @@ class Validator:
             return True, ""
         
         # Check if it contains only alphanumeric characters
-        if not re.match(r'^[a-zA-Z0-9]+$', barcode):
+        if not (barcode.isascii() and barcode.isalnum()):
             return False, "Barcode should contain only letters and numbers"
         
         # Check reasonable length
@@ -306,6 +320,8 @@ class CustomerValidator:
 class ProductValidator:
     """Specialized validator for product data"""
     
+    VALID_UNITS = ("Each", "Box", "Kg", "Liter", "Pair", "Set")
+    
     @staticmethod
     def validate_product_data(product_data: dict) -> Tuple[bool, str]:
         """
@@ -356,10 +372,9 @@ class ProductValidator:
             return False, error
         
         # Validate unit
-        valid_units = ["Each", "Box", "Kg", "Liter", "Pair", "Set"]
         unit = product_data.get('unit', '')
-        if unit not in valid_units:
-            return False, f"Unit must be one of: {', '.join(valid_units)}"
+        if unit not in ProductValidator.VALID_UNITS:
+            return False, f"Unit must be one of: {', '.join(ProductValidator.VALID_UNITS)}"
         
         # Validate expiry date
         expiry_date = product_data.get('expiry_date', '')
@@ -374,6 +389,8 @@ class ProductValidator:
 class SaleValidator:
     """Specialized validator for sales data"""
     
+    VALID_PAYMENT_METHODS = ("Cash", "Credit Card", "Credit (Account)")
+    
     @staticmethod
     def validate_sale_item(item_data: dict) -> Tuple[bool, str]:
         """
@@ -422,16 +439,10 @@ class SaleValidator:
         if not items:
             return False, "Sale must contain at least one item"
         
-        for i, item in enumerate(items):
-            is_valid, error = SaleValidator.validate_sale_item(item)
-            if not is_valid:
-                return False, f"Item {i+1}: {error}"
-        
         # Validate payment method
-        valid_payment_methods = ["Cash", "Credit Card", "Credit (Account)"]
         payment_method = sale_data.get('payment_method', '')
-        if payment_method not in valid_payment_methods:
-            return False, f"Payment method must be one of: {', '.join(valid_payment_methods)}"
+        if payment_method not in SaleValidator.VALID_PAYMENT_METHODS:
+            return False, f"Payment method must be one of: {', '.join(SaleValidator.VALID_PAYMENT_METHODS)}"
         
         # Validate totals
         is_valid, error = Validator.validate_positive_number(
@@ -440,12 +451,23 @@ class SaleValidator:
         if not is_valid:
             return False, error
         
+        # Validate each item last, after the cheap whole-sale checks
+        for i, item in enumerate(items):
+            is_valid, error = SaleValidator.validate_sale_item(item)
+            if not is_valid:
+                return False, f"Item {i+1}: {error}"
+        
         return True, ""
 
 
 class ExpenseValidator:
     """Specialized validator for expense data"""
     
+    VALID_CATEGORIES = (
+        "Rent", "Utilities", "Salaries", "Supplies",
+        "Marketing", "Maintenance", "Transport", "Other"
+    )
+    
     @staticmethod
     def validate_expense_data(expense_data: dict) -> Tuple[bool, str]:
         """
@@ -458,13 +480,9 @@ class ExpenseValidator:
             Tuple of (is_valid, error_message)
         """
         # Validate category
-        valid_categories = [
-            "Rent", "Utilities", "Salaries", "Supplies", 
-            "Marketing", "Maintenance", "Transport", "Other"
-        ]
         category = expense_data.get('category', '')
-        if category not in valid_categories:
-            return False, f"Category must be one of: {', '.join(valid_categories)}"
+        if category not in ExpenseValidator.VALID_CATEGORIES:
+            return False, f"Category must be one of: {', '.join(ExpenseValidator.VALID_CATEGORIES)}"
         
         # Validate amount
         is_valid, error = Validator.validate_positive_number(